@@ -0,0 +1,2 @@
+-- 为已有的 toolify_tools 表增加内容哈希列（增量上传 UPLOAD_DELTA=true 需要）
+ALTER TABLE toolify_tools ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
@@ -0,0 +1,14 @@
+-- 为已有的 toolify_tools 表增加访问量/增长数值列和排序索引
+-- 采集脚本从此写入 *_num 列，需要先执行本文件；已有数据用 scripts/backfill-numeric-metrics.py 回填
+ALTER TABLE toolify_tools ADD COLUMN IF NOT EXISTS monthly_visits_num BIGINT;
+ALTER TABLE toolify_tools ADD COLUMN IF NOT EXISTS growth_num BIGINT;
+ALTER TABLE toolify_tools ADD COLUMN IF NOT EXISTS growth_rate_num DOUBLE PRECISION;
+
+-- 页面按数值降序排列（空值在后）和范围过滤都可以直接走索引
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_monthly_visits_num ON toolify_tools(monthly_visits_num DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_growth_num ON toolify_tools(growth_num DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_growth_rate_num ON toolify_tools(growth_rate_num DESC NULLS LAST);
+-- 升序排列时空值同样在后（nullsFirst: false），降序索引反向扫描得到的是空值在前，需要单独的升序索引
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_monthly_visits_num_asc ON toolify_tools(monthly_visits_num ASC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_growth_num_asc ON toolify_tools(growth_num ASC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_growth_rate_num_asc ON toolify_tools(growth_rate_num ASC NULLS LAST);
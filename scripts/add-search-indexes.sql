@@ -0,0 +1,21 @@
+-- 工具搜索索引：页面搜索对 tool_name / description / tags 做 ILIKE '%关键词%'，没有索引时每次都顺序扫描全表
+-- pg_trgm 的 GIN 索引支持任意位置的 ILIKE，三个条件各走一次位图索引扫描再合并（BitmapOr），耗时只随命中行数增长
+-- 描述和标签是中文：tsvector 的内置分词器不切分中文（整句成为一个词），托管的 Supabase 也没有 zhparser，所以用三元组
+-- 三元组按字符切分，中文同样适用（数据库 LC_CTYPE 需为 UTF-8，Supabase 默认即是）
+-- 关键词不足 3 个字符时（如 "AI"、"视频"）'%关键词%' 提取不出三元组，这类搜索仍会扫描全表，结果不受影响
+-- 短关键词也要走索引时，可在支持 pg_bigm 的实例上为三列另建二元组索引（托管的 Supabase 没有该扩展）:
+-- CREATE EXTENSION IF NOT EXISTS pg_bigm;
+-- CREATE INDEX IF NOT EXISTS idx_toolify_tools_tool_name_bigm ON toolify_tools USING GIN (tool_name gin_bigm_ops);
+-- CREATE INDEX IF NOT EXISTS idx_toolify_tools_description_bigm ON toolify_tools USING GIN (description gin_bigm_ops);
+-- CREATE INDEX IF NOT EXISTS idx_toolify_tools_tags_bigm ON toolify_tools USING GIN (tags gin_bigm_ops);
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_tool_name_trgm ON toolify_tools USING GIN (tool_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_description_trgm ON toolify_tools USING GIN (description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_tags_trgm ON toolify_tools USING GIN (tags gin_trgm_ops);
+
+ANALYZE toolify_tools;
+
+-- 检查是否走索引（应看到 BitmapOr 和三个 Bitmap Index Scan）:
+-- EXPLAIN SELECT * FROM toolify_tools
+--     WHERE tool_name ILIKE '%视频生成%' OR description ILIKE '%视频生成%' OR tags ILIKE '%视频生成%';
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+回填数值列 - 为已有数据计算 monthly_visits_num / growth_num / growth_rate_num
+按 tool_name 键集分页读取，每页解析后用一次 upsert 写回（解析规则与采集时相同）
+需要先执行 scripts/add-numeric-metrics.sql
+
+用法: python scripts/backfill-numeric-metrics.py [--only-missing]
+"""
+
+import sys
+from supabase_rest import client_from_env
+from toolify_records import numeric_metrics
+
+PAGE_SIZE = 1000
+
+def backfill(client, only_missing=False):
+    """返回 (处理行数, 无法解析的行数)"""
+    processed = 0
+    unparsed = 0
+    last_name = None
+
+    while True:
+        params = {
+            'select': 'tool_name,tool_url,monthly_visits,growth,growth_rate',
+            'order': 'tool_name.asc',
+            'limit': PAGE_SIZE
+        }
+        if last_name is not None:
+            params['tool_name'] = f'gt.{last_name}'
+        if only_missing:
+            params['monthly_visits_num'] = 'is.null'
+        response = client.get('toolify_tools', params=params, timeout=60)
+        if response.status_code != 200:
+            print(f"❌ 读取失败: {response.status_code} - {response.text[:200]}")
+            sys.exit(1)
+
+        page = response.json()
+        if not page:
+            break
+
+        # tool_url 非空，upsert 的候选行也要带上
+        updates = []
+        for tool in page:
+            metrics = numeric_metrics(tool)
+            if metrics['monthly_visits_num'] is None:
+                unparsed += 1
+            updates.append({'tool_name': tool['tool_name'], 'tool_url': tool['tool_url'], **metrics})
+
+        response = client.post_json(
+            'toolify_tools?on_conflict=tool_name',
+            updates,
+            headers={'Prefer': 'resolution=merge-duplicates'},
+            timeout=60
+        )
+        if response.status_code not in [200, 201]:
+            print(f"❌ 写回失败: {response.status_code} - {response.text[:200]}")
+            sys.exit(1)
+
+        processed += len(page)
+        last_name = page[-1]['tool_name']
+        print(f"✅ 已回填 {processed} 条（到 {last_name}）")
+
+        if len(page) < PAGE_SIZE:
+            break
+
+    return processed, unparsed
+
+def main():
+    """主函数"""
+    print("=" * 50)
+    print("回填访问量/增长数值列")
+    print("=" * 50)
+
+    client = client_from_env()
+    if not client:
+        print("❌ 请设置 SUPABASE_URL 和 SUPABASE_ANON_KEY")
+        sys.exit(1)
+
+    processed, unparsed = backfill(client, only_missing='--only-missing' in sys.argv)
+    print(f"📊 回填完成: {processed} 条，其中 {unparsed} 条访问量无法解析（保持为空）")
+
+if __name__ == "__main__":
+    main()
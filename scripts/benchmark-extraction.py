@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+行提取性能对比 - 批量 execute_script vs 逐元素提取
+在同一页面、同一批行上分别计时，输出 rows/sec
+"""
+
+import os
+import sys
+import time
+import importlib.util
+
+def load_collector():
+    """加载 production-collector.py（文件名含连字符，无法直接 import）"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "production-collector.py")
+    spec = importlib.util.spec_from_file_location("production_collector", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def time_extraction(name, extract_fn, driver, row_count, rounds):
+    """对同一批行重复提取 rounds 次，返回 rows/sec"""
+    durations = []
+    extracted = 0
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _, raw_rows = extract_fn(driver, 0, row_count)
+        durations.append(time.perf_counter() - start)
+        extracted = len([row for row in raw_rows if "error" not in row])
+
+    best = min(durations)
+    rows_per_sec = extracted / best if best > 0 else 0
+    print(f"   {name}: {extracted} 行, 最快 {best:.3f}s, {rows_per_sec:.1f} rows/sec")
+    return rows_per_sec
+
+def main():
+    """主函数"""
+    print("=" * 50)
+    print("行提取性能对比")
+    print("=" * 50)
+
+    row_count = int(os.getenv('BENCH_ROWS', '200'))
+    rounds = int(os.getenv('BENCH_ROUNDS', '3'))
+
+    collector = load_collector()
+    driver = collector.setup_driver()
+    if not driver:
+        print("❌ 浏览器启动失败")
+        sys.exit(1)
+
+    try:
+        driver.get("https://www.toolify.ai/zh/Best-trending-AI-Tools")
+        time.sleep(8)
+
+        # 先滚动到至少 row_count 行，保证两条路径处理的是同一批行
+        for _ in range(row_count // 10 + 10):
+            total = driver.execute_script("return document.querySelectorAll('tr.el-table__row').length")
+            if total >= row_count:
+                break
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(2)
+
+        total = driver.execute_script("return document.querySelectorAll('tr.el-table__row').length")
+        row_count = min(row_count, total)
+        print(f"🔍 对比行数: {row_count}，每种路径 {rounds} 轮")
+
+        per_element = time_extraction("逐元素提取", collector.extract_rows_per_element, driver, row_count, rounds)
+        bulk = time_extraction("批量提取", collector.extract_rows_bulk, driver, row_count, rounds)
+
+        if per_element > 0:
+            print(f"📊 加速比: {bulk / per_element:.1f}x")
+
+    finally:
+        driver.quit()
+
+if __name__ == "__main__":
+    main()
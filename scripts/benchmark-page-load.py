@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+资源拦截效果对比 - 分别在开启/关闭拦截时加载榜单页并滚动
+输出首屏行出现时间、传输字节数和 JS 堆内存
+"""
+
+import os
+import sys
+import time
+import importlib.util
+
+# 页面内统计：资源传输字节数、请求数、JS 堆占用
+PAGE_METRICS_JS = """
+const resources = performance.getEntriesByType('resource');
+const bytes = resources.reduce((sum, r) => sum + (r.transferSize || 0), 0);
+const heap = performance.memory ? performance.memory.usedJSHeapSize : 0;
+return {requests: resources.length, bytes: bytes, heap: heap};
+"""
+
+def load_collector():
+    """加载 production-collector.py（文件名含连字符，无法直接 import）"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "production-collector.py")
+    spec = importlib.util.spec_from_file_location("production_collector", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def measure(collector, block_resources, scrolls):
+    """加载页面、滚动 scrolls 次，返回指标"""
+    driver = collector.setup_driver(block_resources=block_resources)
+    if not driver:
+        print("❌ 浏览器启动失败")
+        sys.exit(1)
+
+    try:
+        start = time.perf_counter()
+        driver.get(collector.DEFAULT_LISTING_URL)
+        readiness = collector.ScrollReadiness(driver)
+        row_count = readiness.wait_for_rows()
+        first_rows = time.perf_counter() - start
+
+        for _ in range(scrolls):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            row_count = readiness.wait_for_growth(row_count)
+        total = time.perf_counter() - start
+
+        metrics = driver.execute_script(PAGE_METRICS_JS)
+        metrics.update({"first_rows": first_rows, "total": total, "rows": row_count})
+        return metrics
+    finally:
+        driver.quit()
+
+def main():
+    """主函数"""
+    print("=" * 50)
+    print("资源拦截效果对比")
+    print("=" * 50)
+
+    scrolls = int(os.getenv('BENCH_SCROLLS', '20'))
+    collector = load_collector()
+
+    for label, block_resources in (("不拦截", False), ("拦截", True)):
+        m = measure(collector, block_resources, scrolls)
+        print(f"   {label}: 首屏 {m['first_rows']:.2f}s, 总耗时 {m['total']:.2f}s, {m['rows']} 行, "
+              f"{m['requests']} 个请求, {m['bytes'] / 1024:.0f} KB, JS堆 {m['heap'] / 1024 / 1024:.1f} MB")
+
+if __name__ == "__main__":
+    main()
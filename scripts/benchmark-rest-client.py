@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+REST 客户端连接复用对比 - 每次新建连接的 requests.get vs 共用连接池的 SupabaseRest
+对同一个轻量查询各发 N 次，输出单次请求延迟
+"""
+
+import os
+import sys
+import time
+import statistics
+import requests
+from supabase_rest import SupabaseRest
+
+def time_requests(send, rounds):
+    """连续发送 rounds 次请求，返回每次耗时（毫秒）"""
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        response = send()
+        durations.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            print(f"❌ 请求失败: {response.status_code} - {response.text[:200]}")
+            sys.exit(1)
+    return durations
+
+def report(label, durations):
+    print(f"   {label}: 平均 {statistics.mean(durations):.1f}ms, p50 {statistics.median(durations):.1f}ms, "
+          f"最大 {max(durations):.1f}ms")
+
+def main():
+    """主函数"""
+    print("=" * 50)
+    print("REST 客户端连接复用对比")
+    print("=" * 50)
+
+    url = os.getenv('SUPABASE_URL')
+    key = os.getenv('SUPABASE_ANON_KEY')
+    if not url or not key:
+        print("❌ 请设置 SUPABASE_URL 和 SUPABASE_ANON_KEY")
+        sys.exit(1)
+
+    url = url.strip()
+    key = key.strip()
+    rounds = int(os.getenv('BENCH_ROUNDS', '30'))
+    path = 'toolify_tools?select=id&limit=1'
+
+    headers = {
+        'apikey': key,
+        'Authorization': f'Bearer {key}',
+        'Content-Type': 'application/json'
+    }
+    bare = time_requests(lambda: requests.get(f'{url}/rest/v1/{path}', headers=headers, timeout=30), rounds)
+
+    client = SupabaseRest(url, key)
+    client.get(path)  # 预热：建立连接
+    pooled = time_requests(lambda: client.get(path), rounds)
+    client.close()
+
+    print(f"🔍 每种方式 {rounds} 次请求:")
+    report("每次新建连接", bare)
+    report("共用连接池", pooled)
+    print(f"📊 每次请求节省: {statistics.mean(bare) - statistics.mean(pooled):.1f}ms")
+
+if __name__ == "__main__":
+    main()
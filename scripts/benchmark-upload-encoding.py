@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+上传请求体编码对比 - requests 默认 json= vs 紧凑 JSON（orjson/标准库）vs 紧凑 JSON + gzip
+用 sample-data.json 拼出一批数据，离线编码 N 次，输出每批字节数和 CPU 耗时
+"""
+
+import os
+import sys
+import json
+import time
+import gzip
+import supabase_rest
+
+def requests_default(payload):
+    """与 requests 的 json= 参数相同：ensure_ascii + 默认分隔符"""
+    return json.dumps(payload).encode('utf-8')
+
+def compact_gzip(payload):
+    return gzip.compress(supabase_rest.dumps(payload), compresslevel=6, mtime=0)
+
+def measure(encode, payload, rounds):
+    """编码 rounds 次，返回 (字节数, 每批平均 CPU 毫秒)"""
+    start = time.process_time()
+    for _ in range(rounds):
+        body = encode(payload)
+    return len(body), (time.process_time() - start) / rounds * 1000
+
+def main():
+    """主函数"""
+    print("=" * 50)
+    print("上传请求体编码对比")
+    print("=" * 50)
+
+    sample_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sample-data.json')
+    with open(sample_file, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    if not sample:
+        print("❌ sample-data.json 为空")
+        sys.exit(1)
+
+    batch_size = int(os.getenv('BENCH_BATCH_SIZE', '500'))
+    rounds = int(os.getenv('BENCH_ROUNDS', '50'))
+    payload = [dict(sample[i % len(sample)], tool_name=f"{sample[i % len(sample)]['tool_name']}-{i}")
+               for i in range(batch_size)]
+
+    backend = 'orjson' if supabase_rest.HAS_ORJSON else 'json 标准库'
+    print(f"🔍 每批 {batch_size} 条，编码 {rounds} 次，紧凑编码后端: {backend}")
+
+    baseline = None
+    for label, encode in (("requests 默认", requests_default),
+                          ("紧凑 JSON", supabase_rest.dumps),
+                          ("紧凑 JSON + gzip", compact_gzip)):
+        size, cpu_ms = measure(encode, payload, rounds)
+        baseline = baseline or size
+        print(f"   {label}: {size / 1024:.1f} KB/批（{size / baseline:.0%}），CPU {cpu_ms:.2f}ms/批")
+
+if __name__ == "__main__":
+    main()
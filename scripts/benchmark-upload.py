@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+上传吞吐基准 - 按 sample-data.json 的字段分布生成 3k/30k/300k 条数据，分别用各上传模式跑 upload_to_supabase
+输出 JSON：每秒条数、批次延迟 p50/p95、请求数、发送字节数、峰值 RSS
+
+模式: upsert（全新写入）、rpc（全新写入，需要 upsert-tools-function.sql）、
+     delta（先写入全部数据，再改动 BENCH_CHURN 比例的行后增量上传，只计增量这一次）
+每个用例在独立子进程里运行，峰值 RSS 互不影响；不写历史快照（快照表只追加，无法清理 bench- 数据）
+
+环境变量:
+  BENCH_SIZES=3000,30000,300000  BENCH_MODES=upsert,rpc,delta  BENCH_CONCURRENCY=4
+  BENCH_BATCH_SIZE（起始批大小，默认读 system_settings）  BENCH_CHURN=0.05  BENCH_SEED=42
+  BENCH_LOCAL=true 时每个用例启动一个全新的 local-postgrest.py，BENCH_SERVER_ARGS 传故障注入参数，
+  否则使用 SUPABASE_URL / SUPABASE_ANON_KEY（会写入并删除 bench- 前缀的数据）
+  BENCH_OUTPUT 结果另存为文件，BENCH_VERBOSE=true 显示上传日志
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import random
+import resource
+import subprocess
+import contextlib
+import importlib.util
+from datetime import datetime
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_FIELDS = ["tool_url", "monthly_visits", "growth", "growth_rate", "description", "tags"]
+
+def load_collector():
+    """加载 production-collector.py（文件名含连字符，无法直接 import）"""
+    path = os.path.join(SCRIPTS_DIR, "production-collector.py")
+    spec = importlib.util.spec_from_file_location("production_collector", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def build_dataset(count, seed):
+    """每个字段独立地从 sample-data.json 的取值中抽样，工具名加序号保证唯一"""
+    with open(os.path.join(SCRIPTS_DIR, '..', 'sample-data.json'), 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    rng = random.Random(seed)
+    columns = {field: [tool.get(field, "") for tool in sample] for field in SAMPLE_FIELDS}
+    names = [tool["tool_name"] for tool in sample]
+    collected_at = datetime.now().isoformat()
+
+    rows = []
+    for i in range(count):
+        row = {field: rng.choice(values) for field, values in columns.items()}
+        row.update({
+            "ranking": i + 1,
+            "tool_name": f"bench-{i}-{rng.choice(names)}",
+            "collected_at": collected_at,
+            "collection_batch": "benchmark"
+        })
+        rows.append(row)
+    return rows
+
+def churn(rows, ratio, seed):
+    """随机改动 ratio 比例行的访问量，模拟两次采集之间的变化"""
+    rng = random.Random(seed + 1)
+    changed = [dict(row) for row in rows]
+    for i in rng.sample(range(len(changed)), int(len(changed) * ratio)):
+        changed[i]["monthly_visits"] = f"{rng.uniform(1, 999):.1f}K"
+    return changed
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+def run_case(size, mode):
+    """子进程：跑一个用例，结果 JSON 打印到 stdout（上传日志转到 stderr）"""
+    with contextlib.redirect_stdout(sys.stderr):
+        collector = load_collector()
+        client = collector.get_supabase_client()
+        if not client:
+            raise SystemExit("❌ 请设置 SUPABASE_URL 和 SUPABASE_ANON_KEY")
+
+        seed = int(os.getenv('BENCH_SEED', '42'))
+        concurrency = int(os.getenv('BENCH_CONCURRENCY', '4'))
+        batch_size = int(os.getenv('BENCH_BATCH_SIZE')) if os.getenv('BENCH_BATCH_SIZE') else None
+        rows = build_dataset(size, seed)
+
+        if mode == 'delta':
+            # 先写入全部数据（不计时），再上传改动后的数据
+            collector.upload_to_supabase(rows, concurrency=concurrency, batch_size=batch_size, delta=True,
+                                         snapshots=False)
+            rows = churn(rows, float(os.getenv('BENCH_CHURN', '0.05')), seed)
+
+        # 记录每次批量写入请求的耗时
+        latencies = []
+        post_json = client.post_json
+        def timed_post_json(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return post_json(*args, **kwargs)
+            finally:
+                latencies.append((time.perf_counter() - start) * 1000)
+        client.post_json = timed_post_json
+        client.payload_stats = type(client.payload_stats)()
+
+        start = time.perf_counter()
+        ok = collector.upload_to_supabase(rows, concurrency=concurrency, batch_size=batch_size,
+                                          delta=(mode == 'delta'), mode=('rpc' if mode == 'rpc' else 'upsert'),
+                                          snapshots=False)
+        elapsed = time.perf_counter() - start
+
+    # Linux 上 ru_maxrss 单位是 KB
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({
+        "size": size,
+        "mode": mode,
+        "success": bool(ok),
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(size / elapsed, 1) if elapsed else None,
+        "batch_latency_ms": {"p50": round(percentile(latencies, 50), 1), "p95": round(percentile(latencies, 95), 1)},
+        "requests": client.payload_stats.requests,
+        "bytes_sent": client.payload_stats.wire_bytes,
+        "peak_rss_mb": round(peak_rss, 1)
+    }))
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_for_port(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.5):
+            return
+        time.sleep(0.1)
+    raise SystemExit(f"❌ 本地服务未在 {timeout}s 内启动")
+
+def clear_bench_rows(env):
+    """远程端点：删除 bench- 前缀的数据"""
+    sys.path.insert(0, SCRIPTS_DIR)
+    from supabase_rest import SupabaseRest
+    client = SupabaseRest(env['SUPABASE_URL'], env['SUPABASE_ANON_KEY'])
+    response = client.delete('toolify_tools', params={'tool_name': 'like.bench-*'}, timeout=120)
+    client.close()
+    if response.status_code not in [200, 204]:
+        raise SystemExit(f"❌ 清理 bench- 数据失败: {response.status_code} - {response.text[:200]}")
+
+def run_suite():
+    """父进程：逐个用例启动子进程并汇总结果"""
+    sizes = [int(s) for s in os.getenv('BENCH_SIZES', '3000,30000,300000').split(',') if s.strip()]
+    modes = [m.strip() for m in os.getenv('BENCH_MODES', 'upsert,rpc,delta').split(',') if m.strip()]
+    local = os.getenv('BENCH_LOCAL', '').strip().lower() in ('1', 'true', 'yes')
+    verbose = os.getenv('BENCH_VERBOSE', '').strip().lower() in ('1', 'true', 'yes')
+    server_args = os.getenv('BENCH_SERVER_ARGS', '').split()
+
+    if not local and (not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY')):
+        print("❌ 请设置 SUPABASE_URL 和 SUPABASE_ANON_KEY，或使用 BENCH_LOCAL=true")
+        sys.exit(1)
+
+    results = []
+    for size in sizes:
+        for mode in modes:
+            env = dict(os.environ)
+            server = None
+            if local:
+                port = free_port()
+                server = subprocess.Popen(
+                    [sys.executable, os.path.join(SCRIPTS_DIR, "local-postgrest.py"), "--port", str(port)] + server_args,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+                wait_for_port(port)
+                env.update({"SUPABASE_URL": f"http://127.0.0.1:{port}", "SUPABASE_ANON_KEY": "local"})
+            else:
+                clear_bench_rows(env)
+
+            print(f"⏱️ {mode} × {size} 条...", file=sys.stderr)
+            try:
+                completed = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--case", str(size), mode],
+                    env=env, stdout=subprocess.PIPE, stderr=None if verbose else subprocess.DEVNULL, text=True
+                )
+            finally:
+                if server:
+                    server.terminate()
+                    server.wait()
+                else:
+                    clear_bench_rows(env)
+
+            if completed.returncode != 0 or not completed.stdout.strip():
+                results.append({"size": size, "mode": mode, "success": False, "error": f"exit {completed.returncode}"})
+                continue
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    report = {
+        "endpoint": "local-postgrest" if local else os.getenv('SUPABASE_URL'),
+        "server_args": server_args if local else None,
+        "concurrency": int(os.getenv('BENCH_CONCURRENCY', '4')),
+        "batch_size": os.getenv('BENCH_BATCH_SIZE') or "system_settings",
+        "results": results
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if os.getenv('BENCH_OUTPUT'):
+        with open(os.getenv('BENCH_OUTPUT'), 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--case":
+        run_case(int(sys.argv[2]), sys.argv[3])
+    else:
+        run_suite()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+批量 upsert 路径对比 - PostgREST merge-duplicates vs upsert_toolify_tools 函数
+用 sample-data.json 生成 N 条 bench- 前缀的数据，每种模式先全新写入、再原样重写一次（全部未变化），
+输出耗时和每秒条数；结束后删除 bench- 数据
+需要先执行 scripts/upsert-tools-function.sql
+"""
+
+import os
+import sys
+import json
+import time
+import importlib.util
+
+def load_collector():
+    """加载 production-collector.py（文件名含连字符，无法直接 import）"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "production-collector.py")
+    spec = importlib.util.spec_from_file_location("production_collector", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def build_rows(count):
+    """按 sample-data.json 循环生成 count 条工具名唯一的数据"""
+    sample_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sample-data.json')
+    with open(sample_file, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    return [
+        dict(sample[i % len(sample)], ranking=i + 1, tool_name=f"bench-{i}-{sample[i % len(sample)]['tool_name']}",
+             collection_batch="benchmark")
+        for i in range(count)
+    ]
+
+def clear_bench_rows(client):
+    response = client.delete('toolify_tools', params={'tool_name': 'like.bench-*'}, timeout=60)
+    if response.status_code not in [200, 204]:
+        print(f"❌ 清理 bench- 数据失败: {response.status_code} - {response.text[:200]}")
+        sys.exit(1)
+
+def main():
+    """主函数"""
+    print("=" * 50)
+    print("批量 upsert 路径对比")
+    print("=" * 50)
+
+    collector = load_collector()
+    client = collector.get_supabase_client()
+    if not client:
+        print("❌ 请设置 SUPABASE_URL 和 SUPABASE_ANON_KEY")
+        sys.exit(1)
+
+    count = int(os.getenv('BENCH_ROWS', '3000'))
+    batch_size = int(os.getenv('BENCH_BATCH_SIZE', '500'))
+    concurrency = int(os.getenv('BENCH_CONCURRENCY', '4'))
+    rows = build_rows(count)
+
+    results = []
+    for mode in ('upsert', 'rpc'):
+        clear_bench_rows(client)
+        for label in ("全新写入", "原样重写"):
+            start = time.perf_counter()
+            ok = collector.upload_to_supabase(rows, concurrency=concurrency, batch_size=batch_size,
+                                              delta=False, mode=mode, snapshots=False)
+            elapsed = time.perf_counter() - start
+            if not ok:
+                print(f"❌ {mode} {label}失败")
+                clear_bench_rows(client)
+                sys.exit(1)
+            results.append((mode, label, elapsed))
+    clear_bench_rows(client)
+
+    print(f"🔍 {count} 条，起始每批 {batch_size} 条，并发 {concurrency}:")
+    for mode, label, elapsed in results:
+        print(f"   {mode} {label}: {elapsed:.2f}s, {count / elapsed:.0f} 条/秒")
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@
 
 import os
 import sys
-import requests
+from supabase_rest import SupabaseRest
 from datetime import datetime
 
 # 设置Windows编码
@@ -33,18 +33,13 @@ def clear_database():
 
     print(f"🔗 连接数据库: {url[:50]}...")
 
-    headers = {
-        'apikey': key,
-        'Authorization': f'Bearer {key}',
-        'Content-Type': 'application/json'
-    }
+    client = SupabaseRest(url, key)
 
     try:
         # 1. 查看当前数据量
         print("📊 查询当前数据量...")
-        count_response = requests.get(
-            f'{url}/rest/v1/toolify_tools?select=count(*)',
-            headers=headers,
+        count_response = client.get(
+            'toolify_tools?select=count(*)',
             timeout=30
         )
 
@@ -56,9 +51,8 @@ def clear_database():
 
         # 2. 清除所有数据
         print("🗑️ 删除所有工具数据...")
-        delete_response = requests.delete(
-            f'{url}/rest/v1/toolify_tools?id=neq.null',  # 删除所有记录
-            headers=headers,
+        delete_response = client.delete(
+            'toolify_tools?id=neq.null',  # 删除所有记录
             timeout=60
         )
 
@@ -69,9 +63,8 @@ def clear_database():
 
         # 3. 清除用户操作数据
         print("🗑️ 删除所有用户操作数据...")
-        user_delete_response = requests.delete(
-            f'{url}/rest/v1/user_actions?id=neq.null',  # 删除所有记录
-            headers=headers,
+        user_delete_response = client.delete(
+            'user_actions?id=neq.null',  # 删除所有记录
             timeout=60
         )
 
@@ -82,9 +75,8 @@ def clear_database():
 
         # 4. 验证清理结果
         print("🔍 验证清理结果...")
-        verify_response = requests.get(
-            f'{url}/rest/v1/toolify_tools?select=count(*)',
-            headers=headers,
+        verify_response = client.get(
+            'toolify_tools?select=count(*)',
             timeout=30
         )
 
@@ -117,24 +109,18 @@ def show_database_stats():
         print("❌ 环境变量缺失")
         return
 
-    headers = {
-        'apikey': key.strip(),
-        'Authorization': f'Bearer {key.strip()}',
-        'Content-Type': 'application/json'
-    }
+    client = SupabaseRest(url, key)
 
     try:
         # 工具数据统计
-        tools_response = requests.get(
-            f'{url.strip()}/rest/v1/toolify_tools?select=count(*)',
-            headers=headers,
+        tools_response = client.get(
+            'toolify_tools?select=count(*)',
             timeout=30
         )
 
         # 用户操作统计
-        actions_response = requests.get(
-            f'{url.strip()}/rest/v1/user_actions?select=count(*)',
-            headers=headers,
+        actions_response = client.get(
+            'user_actions?select=count(*)',
             timeout=30
         )
 
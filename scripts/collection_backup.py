@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+采集备份 - 边采集边写入的压缩 NDJSON（gzip，安装了 zstandard 时可选 zstd）
+首行是索引头 {"header": {格式版本、来源、批次、创建时间、压缩方式}}，
+之后每行一条数据，末行是汇总 {"footer": {"rows": 行数, "sha256": 数据行的校验和}}
+行数和校验和要写完才知道，所以放在末行；进程中途退出时没有末行，读取时按已写入的行处理
+
+每次运行一个文件: <来源>-backup-<时间>.ndjson.gz，只保留每个来源最近 BACKUP_KEEP 次（默认 7）
+BACKUP_CODEC=gzip|zstd 选择压缩方式，BACKUP_DIR 指定目录（默认当前目录）
+"""
+
+import os
+import sys
+import glob
+import gzip
+import json
+import hashlib
+from datetime import datetime
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+BACKUP_FORMAT = "toolify-backup"
+BACKUP_VERSION = 1
+CODEC_SUFFIXES = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+
+def backup_codec():
+    """BACKUP_CODEC 指定的压缩方式，zstd 不可用时退回 gzip"""
+    codec = os.getenv('BACKUP_CODEC', 'gzip').strip().lower() or 'gzip'
+    if codec not in CODEC_SUFFIXES:
+        print(f"⚠️ 未知的 BACKUP_CODEC={codec}，使用 gzip")
+        return 'gzip'
+    if codec == 'zstd' and not HAS_ZSTD:
+        print("⚠️ 未安装 zstandard，备份改用 gzip")
+        return 'gzip'
+    return codec
+
+
+def backup_path(source, codec='gzip', directory=None):
+    """本次运行的备份文件名，例如 ./toolify-backup-2025-01-01-120000.ndjson.gz"""
+    directory = directory or os.getenv('BACKUP_DIR') or '.'
+    stamp = datetime.now().strftime('%Y-%m-%d-%H%M%S')
+    return os.path.join(directory, f"{source}-backup-{stamp}{CODEC_SUFFIXES[codec]}")
+
+
+def backup_keep():
+    return int(os.getenv('BACKUP_KEEP') or '7')
+
+
+def rotate_backups(source, keep, directory=None, current=None):
+    """只保留某个来源最近 keep 个备份（含旧版 .json），current 是本次的文件、不会被删除，返回删除的文件"""
+    directory = directory or os.getenv('BACKUP_DIR') or '.'
+    paths = glob.glob(os.path.join(directory, f"{source}-backup-*.ndjson.*"))
+    paths += glob.glob(os.path.join(directory, f"{source}-backup-*.json"))
+    current = os.path.abspath(current) if current else None
+    paths = sorted((path for path in paths if os.path.abspath(path) != current), key=os.path.getmtime)
+    # 本次的文件占一个名额
+    keep = keep - 1 if current else keep
+    removed = paths[:-keep] if keep > 0 else paths
+    for path in removed:
+        os.remove(path)
+    if removed:
+        print(f"🧹 已删除 {len(removed)} 个旧备份")
+    return removed
+
+
+def _open_compressed(path, mode, codec):
+    if codec == 'zstd':
+        if mode == 'wb':
+            return zstandard.ZstdCompressor().stream_writer(open(path, 'wb'), closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True, read_across_frames=True)
+    return gzip.open(path, mode, compresslevel=6) if mode == 'wb' else gzip.open(path, mode)
+
+
+class BackupWriter:
+    """备份写入器：逐行压缩写出，内存占用与数据量无关
+
+    索引头在第一次写入时才写出，未指定批次时取第一行的 collection_batch
+    """
+
+    def __init__(self, path, source, batch=None, codec='gzip'):
+        self.path = path
+        self.source = source
+        self.batch = batch
+        self.codec = codec
+        self.rows = 0
+        self.checksum = hashlib.sha256()
+        self.file = None
+        self.keep = None  # 设置后 close() 时只保留最近 keep 个备份
+
+    @classmethod
+    def for_run(cls, source, batch=None):
+        """按环境变量选择压缩方式和目录；旧备份在本次写完汇总行后才清理"""
+        codec = backup_codec()
+        writer = cls(backup_path(source, codec), source, batch=batch, codec=codec)
+        writer.keep = backup_keep()
+        return writer
+
+    def _write_line(self, entry):
+        self.file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b"\n")
+
+    def _open(self, first_row=None):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.file = _open_compressed(self.path, 'wb', self.codec)
+        if self.batch is None and first_row:
+            self.batch = first_row.get('collection_batch')
+        self._write_line({"header": {
+            "format": BACKUP_FORMAT,
+            "version": BACKUP_VERSION,
+            "source": self.source,
+            "batch": self.batch,
+            "created_at": datetime.now().isoformat(),
+            "codec": self.codec
+        }})
+
+    def write(self, rows):
+        """追加一批数据"""
+        if not rows:
+            return
+        if self.file is None:
+            self._open(rows[0])
+        for tool in rows:
+            line = json.dumps(tool, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b"\n"
+            self.checksum.update(line)
+            self.file.write(line)
+        self.rows += len(rows)
+
+    def flush(self):
+        """把已写入的数据刷到磁盘，进程中途退出时能读出到这里为止的行"""
+        if self.file is None:
+            return
+        if self.codec == 'zstd':
+            self.file.flush(zstandard.FLUSH_BLOCK)
+        else:
+            self.file.flush()
+
+    def close(self):
+        """写出汇总行并关闭，再清理旧备份；没写过数据时也生成只有索引头的文件
+
+        清理放在最后，采集中途失败时不会在没有完整新备份的情况下删掉旧备份
+        """
+        if self.file is None:
+            self._open()
+        self._write_line({"footer": {"rows": self.rows, "sha256": self.checksum.hexdigest()}})
+        self.file.close()
+        self.file = None
+        size = os.path.getsize(self.path)
+        print(f"💾 本地备份已保存: {self.path}（{self.rows} 条，{size / 1024:.1f} KB）")
+        if self.keep is not None:
+            rotate_backups(self.source, self.keep, os.path.dirname(self.path), current=self.path)
+
+
+class BackupReader:
+    """按需逐行读取备份，遍历完后 complete 表示是否读到汇总行且行数、校验和一致
+
+    也能读取旧版的 .json 备份（JSON 数组），旧版没有索引头和汇总
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self.footer = None
+        self.rows = 0
+        self.complete = False
+        if self._is_ndjson():
+            self._lines = self._iter_lines()
+            first = next(self._lines, None)
+            self.header = json.loads(first).get("header") if first else None
+            if not self.header:
+                raise ValueError(f"{path} 缺少备份索引头")
+
+    def _is_ndjson(self):
+        return any(self.path.endswith(suffix) for suffix in CODEC_SUFFIXES.values()) or self.path.endswith('.ndjson')
+
+    def _iter_lines(self):
+        if self.path.endswith('.zst'):
+            if not HAS_ZSTD:
+                raise RuntimeError(f"读取 {self.path} 需要安装 zstandard")
+            stream = _open_compressed(self.path, 'rb', 'zstd')
+        elif self.path.endswith('.gz'):
+            stream = _open_compressed(self.path, 'rb', 'gzip')
+        else:
+            stream = open(self.path, 'rb')
+        with stream:
+            try:
+                # zstd 解压流不支持按行迭代
+                yield from (_split_lines(stream) if self.path.endswith('.zst') else stream)
+            except (EOFError, OSError) as e:
+                # 进程中途退出时压缩流没有结尾
+                print(f"⚠️ {self.path} 不完整: {e}", file=sys.stderr)
+
+    def __iter__(self):
+        if self.header is None:
+            yield from self._iter_legacy()
+            return
+
+        checksum = hashlib.sha256()
+        for line in self._lines:
+            if not line.endswith(b"\n"):
+                break  # 最后一行只写了一半
+            if line.startswith(b'{"footer"'):
+                self.footer = json.loads(line)["footer"]
+                break
+            checksum.update(line)
+            self.rows += 1
+            yield json.loads(line)
+
+        if self.footer is None:
+            print(f"⚠️ {self.path} 没有汇总行（采集中断？），已读取 {self.rows} 条", file=sys.stderr)
+        elif self.footer["rows"] != self.rows:
+            raise ValueError(f"{self.path} 行数不符: 汇总 {self.footer['rows']} 条，实际读取 {self.rows} 条")
+        elif self.footer["sha256"] != checksum.hexdigest():
+            raise ValueError(f"{self.path} 校验和不符，文件可能已损坏")
+        else:
+            self.complete = True
+
+    def _iter_legacy(self):
+        """旧版备份：采集脚本每行写一个对象；带缩进的 JSON 数组整体解析"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip().rstrip(',')
+                if line in ('', '[', ']'):
+                    continue
+                try:
+                    tool = json.loads(line)
+                except json.JSONDecodeError:
+                    if self.rows:
+                        print(f"⚠️ {self.path} 第 {self.rows + 1} 条无法解析，按已读取的 {self.rows} 条处理", file=sys.stderr)
+                        return
+                    break
+                self.rows += 1
+                yield tool
+            else:
+                self.complete = True
+                return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        self.rows = len(rows)
+        self.complete = True
+        yield from rows
+
+
+def _split_lines(stream, chunk_size=1 << 16):
+    """没有 readline 的解压流按块读取后切行"""
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + b"\n"
+    if pending:
+        yield pending
+
+
+def read_backup(path):
+    """逐条读取备份中的数据"""
+    return iter(BackupReader(path))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+采集断点日志 - 追加写入的 NDJSON，每 N 行 fsync 一次
+每行是一条采集记录 {"row": {...}} 或一次上传确认 {"uploaded": [tool_name, ...]}
+进程中途退出后用 load_journal() 恢复已采集的数据和已上传的工具名
+DeadLetterFile 记录上传时被服务器拒绝的行及错误信息
+"""
+
+import os
+import glob
+import json
+import threading
+
+
+def latest_journal(pattern="./toolify-journal-*.ndjson"):
+    """最近修改的断点日志；日志按日期命名，跨过零点续采时要找前一天的文件"""
+    paths = glob.glob(pattern)
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def load_journal(path):
+    """读取断点日志，返回 (按排名排序的已采集行, 已上传的工具名集合)
+
+    最后一行可能因崩溃只写了一半，解析失败的行直接跳过
+    """
+    rows = {}
+    uploaded = set()
+
+    if not os.path.exists(path):
+        return [], uploaded
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if "row" in entry:
+                rows[entry["row"]["tool_name"]] = entry["row"]
+            elif "uploaded" in entry:
+                uploaded.update(entry["uploaded"])
+
+    return sorted(rows.values(), key=lambda tool: tool["ranking"]), uploaded
+
+
+class CollectionJournal:
+    """断点日志写入器，采集线程和上传线程共用"""
+
+    def __init__(self, path, fsync_every=50):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.pending_rows = 0  # 距上次 fsync 新写入的行数
+        self.lock = threading.Lock()
+        self.file = None
+
+    def open(self, resume=False):
+        """打开日志；resume=True 时在原日志后追加，否则重新开始"""
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending_rows = 0
+
+    def append_rows(self, rows):
+        """追加采集记录，累计满 fsync_every 行落盘一次"""
+        with self.lock:
+            for tool in rows:
+                self.file.write(json.dumps({"row": tool}, ensure_ascii=False) + "\n")
+            self.pending_rows += len(rows)
+            if self.pending_rows >= self.fsync_every:
+                self._sync()
+            else:
+                self.file.flush()
+
+    def mark_uploaded(self, tool_names):
+        """记录一批已上传成功的工具名（丢失只会导致重复 upsert，无需 fsync）"""
+        with self.lock:
+            self.file.write(json.dumps({"uploaded": list(tool_names)}, ensure_ascii=False) + "\n")
+            self.file.flush()
+
+    def close(self):
+        """落盘并关闭"""
+        if self.file:
+            with self.lock:
+                self._sync()
+                self.file.close()
+                self.file = None
+
+
+class DeadLetterFile:
+    """被服务器拒绝的行，每行一条 {"row": {...}, "status": ..., "error": "..."}，首次写入时才创建文件"""
+
+    def __init__(self, path):
+        self.path = path
+        self.names = set()  # 已写入的工具名
+        self.lock = threading.Lock()
+        self.file = None
+
+    def write(self, tool, status, error):
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, 'a', encoding='utf-8')
+            self.file.write(json.dumps({"row": tool, "status": status, "error": error}, ensure_ascii=False) + "\n")
+            self.file.flush()
+            self.names.add(tool.get("tool_name"))
+
+    def close(self):
+        if self.file:
+            with self.lock:
+                self.file.close()
+                self.file = None
+            print(f"☠️ {len(self.names)} 条被服务器拒绝的数据已写入: {self.path}")
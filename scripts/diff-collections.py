@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+对比两次采集 - 输出新增工具、消失工具、排名变化和字段变化
+每个输入可以是 collection_batch 批次号（从 toolify_tool_snapshots 分页读取）或采集备份文件（toolify-backup-*.ndjson.gz，也支持旧版 .json）
+旧数据按 tool_name 建哈希表，新数据边读边查表，整体 O(n)，只有旧的一侧常驻内存
+
+用法: python scripts/diff-collections.py OLD NEW [--format json|csv] [--min-move N] [--output 文件]
+  --min-move  排名变化至少 N 位才列出（默认 1）
+结果写到 stdout（或 --output），日志写到 stderr；批次号需要设置 SUPABASE_URL 和 SUPABASE_ANON_KEY
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from supabase_rest import client_from_env
+from collection_backup import read_backup
+from toolify_records import batch_date
+
+COMPARE_FIELDS = ("tool_url", "monthly_visits", "growth", "growth_rate", "description", "tags")
+SNAPSHOT_SELECT = "tool_name,ranking," + ",".join(COMPARE_FIELDS)
+PAGE_SIZE = 1000
+
+def log(message):
+    print(message, file=sys.stderr)
+
+def iter_batch(client, batch):
+    """按 tool_name 键集分页读取某个批次的快照（主键 (collection_batch, tool_name, batch_date) 保证批次内不重复）"""
+    # 批次号带日期时同时按分区键过滤，只扫描该月的分区
+    day = batch_date(batch)
+    last_name = None
+    while True:
+        params = {
+            'select': SNAPSHOT_SELECT,
+            'collection_batch': f'eq.{batch}',
+            'order': 'tool_name.asc',
+            'limit': PAGE_SIZE
+        }
+        if day:
+            params['batch_date'] = f'eq.{day}'
+        if last_name is not None:
+            params['tool_name'] = f'gt.{last_name}'
+        response = client.get('toolify_tool_snapshots', params=params, timeout=60)
+        if response.status_code != 200:
+            raise SystemExit(f"❌ 读取批次 {batch} 失败: {response.status_code} - {response.text[:200]}")
+
+        page = response.json()
+        yield from page
+        if len(page) < PAGE_SIZE:
+            break
+        last_name = page[-1]['tool_name']
+
+def open_source(source, clients):
+    """存在的文件按备份读取，否则当作批次号（两个批次共用一个连接）"""
+    if os.path.isfile(source):
+        return read_backup(source)
+    if not clients:
+        clients.append(client_from_env())
+    client = clients[0]
+    if not client:
+        raise SystemExit(f"❌ {source} 不是文件；按批次号读取需要设置 SUPABASE_URL 和 SUPABASE_ANON_KEY")
+    return iter_batch(client, source)
+
+def diff_collections(old_rows, new_rows, min_move=1):
+    """返回 (汇总, 新增, 消失, 排名变化, 字段变化)
+
+    同一侧出现重复的工具名时两侧都只取第一次出现的行（新的一侧边读边比，无法等到后面的重复行）
+    """
+    old = {}
+    for tool in old_rows:
+        old.setdefault(tool['tool_name'], tool)
+    old_count = len(old)
+    seen = set()
+    added, moves, changes = [], [], []
+
+    for tool in new_rows:
+        name = tool['tool_name']
+        if name in seen:
+            continue
+        seen.add(name)
+
+        before = old.pop(name, None)
+        if before is None:
+            added.append({'tool_name': name, 'ranking': tool.get('ranking')})
+            continue
+
+        old_rank, new_rank = before.get('ranking'), tool.get('ranking')
+        if old_rank is not None and new_rank is not None and abs(old_rank - new_rank) >= min_move:
+            # delta 为正表示排名上升
+            moves.append({'tool_name': name, 'old': old_rank, 'new': new_rank, 'delta': old_rank - new_rank})
+        for field in COMPARE_FIELDS:
+            if before.get(field) != tool.get(field):
+                changes.append({'tool_name': name, 'field': field, 'old': before.get(field), 'new': tool.get(field)})
+
+    dropped = [{'tool_name': name, 'ranking': tool.get('ranking')} for name, tool in old.items()]
+    moves.sort(key=lambda move: -abs(move['delta']))
+
+    summary = {
+        'old_count': old_count,
+        'new_count': len(seen),
+        'added': len(added),
+        'dropped': len(dropped),
+        'moved': len(moves),
+        'changed_tools': len({change['tool_name'] for change in changes}),
+        'field_changes': len(changes)
+    }
+    return summary, added, dropped, moves, changes
+
+def write_json(out, sources, result):
+    summary, added, dropped, moves, changes = result
+    # json.dump 逐块走纯 Python 编码器，一次性 dumps 快得多
+    out.write(json.dumps({
+        'old': sources[0],
+        'new': sources[1],
+        'summary': summary,
+        'added': added,
+        'dropped': dropped,
+        'rank_moves': moves,
+        'field_changes': changes
+    }, ensure_ascii=False, separators=(',', ':')) + "\n")
+
+def write_csv(out, result):
+    """每行一个变化: change,tool_name,field,old,new"""
+    _, added, dropped, moves, changes = result
+    writer = csv.writer(out)
+    writer.writerow(['change', 'tool_name', 'field', 'old', 'new'])
+    writer.writerows(['added', tool['tool_name'], 'ranking', '', tool['ranking']] for tool in added)
+    writer.writerows(['dropped', tool['tool_name'], 'ranking', tool['ranking'], ''] for tool in dropped)
+    writer.writerows(['moved', move['tool_name'], 'ranking', move['old'], move['new']] for move in moves)
+    writer.writerows(['changed', change['tool_name'], change['field'], change['old'], change['new']]
+                     for change in changes)
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="对比两次采集（批次号或备份文件）")
+    parser.add_argument("old", help="旧的批次号或备份文件")
+    parser.add_argument("new", help="新的批次号或备份文件")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--min-move", type=int, default=1, help="排名变化至少多少位才列出")
+    parser.add_argument("--output", help="结果写入文件，默认 stdout")
+    args = parser.parse_args()
+
+    clients = []
+    start = time.perf_counter()
+    result = diff_collections(open_source(args.old, clients), open_source(args.new, clients),
+                              max(args.min_move, 1))
+    elapsed = time.perf_counter() - start
+
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'csv':
+            write_csv(out, result)
+        else:
+            write_json(out, [args.old, args.new], result)
+    finally:
+        if args.output:
+            out.close()
+
+    summary = result[0]
+    log(f"📊 {summary['old_count']} → {summary['new_count']} 个工具: 新增 {summary['added']}，"
+        f"消失 {summary['dropped']}，排名变化 {summary['moved']}，"
+        f"{summary['changed_tools']} 个工具共 {summary['field_changes']} 处字段变化（{elapsed:.3f}s）")
+
+if __name__ == "__main__":
+    main()
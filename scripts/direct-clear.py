@@ -3,7 +3,7 @@
 直接清理数据库脚本
 """
 
-import requests
+from supabase_rest import SupabaseRest
 
 def clear_database():
     """清除数据库中的测试数据"""
@@ -15,18 +15,13 @@ def clear_database():
 
     print(f"Connecting to database: {url[:50]}...")
 
-    headers = {
-        'apikey': key,
-        'Authorization': f'Bearer {key}',
-        'Content-Type': 'application/json'
-    }
+    client = SupabaseRest(url, key)
 
     try:
         # 查看当前数据量
         print("Checking current data count...")
-        count_response = requests.get(
-            f'{url}/rest/v1/toolify_tools?select=*',
-            headers=headers,
+        count_response = client.get(
+            'toolify_tools?select=*',
             timeout=30
         )
 
@@ -40,9 +35,8 @@ def clear_database():
 
         # 清除所有工具数据
         print("Deleting all tool data...")
-        delete_response = requests.delete(
-            f'{url}/rest/v1/toolify_tools?ranking=gte.1',
-            headers=headers,
+        delete_response = client.delete(
+            'toolify_tools?ranking=gte.1',
             timeout=60
         )
 
@@ -56,9 +50,8 @@ def clear_database():
 
         # 清除用户操作数据
         print("Deleting all user action data...")
-        user_delete_response = requests.delete(
-            f'{url}/rest/v1/user_actions?action_type=in.(favorite,exclude)',
-            headers=headers,
+        user_delete_response = client.delete(
+            'user_actions?action_type=in.(favorite,exclude)',
             timeout=60
         )
 
@@ -71,9 +64,8 @@ def clear_database():
 
         # 验证清理结果
         print("Verifying cleanup results...")
-        verify_response = requests.get(
-            f'{url}/rest/v1/toolify_tools?select=*',
-            headers=headers,
+        verify_response = client.get(
+            'toolify_tools?select=*',
             timeout=30
         )
 
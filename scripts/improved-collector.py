@@ -5,13 +5,14 @@
 
 import os
 import time
-import json
 import requests
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+from scroll_readiness import ScrollReadiness
+from collection_backup import BackupWriter
 
 def setup_driver():
     """设置Chrome浏览器"""
@@ -24,6 +25,7 @@ def setup_driver():
     options.add_argument("--disable-gpu")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--lang=zh-CN")
+    options.page_load_strategy = "eager"  # 不等图片等资源，表格行由就绪等待层判断
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
 
@@ -53,23 +55,39 @@ def setup_driver():
         print(f"❌ Chrome启动失败: {e}")
         return None
 
-def improved_collect_data(target_count=300):
-    """改进的数据采集方法"""
+# 只取游标之后的行：一次往返返回 [总行数, 第 K 行起的行元素]
+ROW_SLICE_JS = """
+const rows = document.querySelectorAll('tr.el-table__row');
+return [rows.length, Array.prototype.slice.call(rows, arguments[0])];
+"""
+
+# 同一行提取失败这么多次后游标越过它，否则游标一直停在坏行上，每轮都要重扫其后的全部行
+MAX_ROW_ATTEMPTS = 3
+
+def improved_collect_data(backup, target_count=300):
+    """改进的数据采集方法
+
+    每轮提取到的新行立即写入备份，内存中只保留工具名和前 5 条样本，返回采集条数
+    """
     print(f"🚀 开始改进采集，目标: {target_count} 条")
 
     driver = setup_driver()
     if not driver:
-        return []
+        return 0
 
-    tools_data = []
-    seen_tools = set()  # 记录已采集的工具名，避免重复
+    collected = 0
+    samples = []  # 前 5 条，用于结束时打印样本
+    seen_tools = set()  # 记录已采集的工具名（行的稳定键），避免重复
+    row_cursor = 0  # 已处理到的行号，每次只访问其后的新行
+    row_failures = {}  # 行号 -> 提取失败次数
 
     try:
         url = "https://www.toolify.ai/zh/Best-trending-AI-Tools"
         print(f"📱 访问: {url}")
 
         driver.get(url)
-        time.sleep(8)  # 等待页面加载
+        readiness = ScrollReadiness(driver)
+        readiness.wait_for_rows()  # 等待表格数据出现
 
         print(f"📄 页面标题: {driver.title}")
 
@@ -81,20 +99,29 @@ def improved_collect_data(target_count=300):
         for attempt in range(max_attempts):
             print(f"\n📊 第{attempt + 1}次采集尝试...")
 
-            # 获取当前页面的所有数据行
+            # 只获取游标之后的新行，每次滚动的开销不随已加载行数增长
             try:
-                current_rows = driver.find_elements(By.CSS_SELECTOR, "tr.el-table__row")
-                print(f"🔍 当前页面显示 {len(current_rows)} 行数据")
+                total_rows, new_rows = driver.execute_script(ROW_SLICE_JS, row_cursor)
+                print(f"🔍 当前页面显示 {total_rows} 行数据，新增 {len(new_rows)} 行")
 
-                if not current_rows:
+                if total_rows == 0:
                     print("⚠️ 未找到数据行")
                     break
 
+                if total_rows < row_cursor:
+                    # 表格被重新渲染变短，从头扫描，靠工具名去重
+                    print("⚠️ 行数少于游标，表格可能已重新渲染，重置游标")
+                    row_cursor = 0
+                    row_failures.clear()
+                    total_rows, new_rows = driver.execute_script(ROW_SLICE_JS, row_cursor)
+
                 # 提取新数据
-                new_data_count = 0
-                for i, row in enumerate(current_rows):
-                    if len(tools_data) >= target_count:
+                new_batch = []
+                first_failed = None  # 提取失败的行下次重试，游标不越过它
+                for i, row in enumerate(new_rows, start=row_cursor):
+                    if collected >= target_count:
                         break
+                    row_cursor = i + 1
 
                     try:
                         # 提取工具信息
@@ -109,7 +136,7 @@ def improved_collect_data(target_count=300):
                         cells = row.find_elements(By.TAG_NAME, "td")
 
                         tool_data = {
-                            "ranking": len(tools_data) + 1,
+                            "ranking": collected + 1,
                             "tool_name": tool_name,
                             "tool_url": f"https://www.toolify.ai{tool_url}" if tool_url.startswith("/") else tool_url,
                             "monthly_visits": cells[2].find_element(By.TAG_NAME, "span").text.strip() if len(cells) > 2 else "",
@@ -121,20 +148,36 @@ def improved_collect_data(target_count=300):
                             "collection_batch": f"improved-{datetime.now().strftime('%Y-%m-%d')}"
                         }
 
-                        tools_data.append(tool_data)
+                        new_batch.append(tool_data)
                         seen_tools.add(tool_name)
-                        new_data_count += 1
+                        collected += 1
+                        if len(samples) < 5:
+                            samples.append(tool_data)
 
-                        if len(tools_data) % 25 == 0:
-                            print(f"   📈 已采集 {len(tools_data)} 条数据...")
+                        if collected % 25 == 0:
+                            print(f"   📈 已采集 {collected} 条数据...")
 
                     except Exception as e:
-                        print(f"   ❌ 提取第{i+1}行失败: {e}")
+                        row_failures[i] = row_failures.get(i, 0) + 1
+                        if row_failures[i] >= MAX_ROW_ATTEMPTS:
+                            print(f"   ❌ 提取第{i+1}行失败 {row_failures[i]} 次，跳过该行: {e}")
+                        else:
+                            print(f"   ❌ 提取第{i+1}行失败: {e}")
+                            if first_failed is None:
+                                first_failed = i
 
-                print(f"✅ 本次新增 {new_data_count} 条数据，总计 {len(tools_data)} 条")
+                if first_failed is not None:
+                    row_cursor = first_failed
+
+                # 本轮的新行写入备份并刷盘，中途退出时已采集的数据不会丢
+                new_data_count = len(new_batch)
+                backup.write(new_batch)
+                backup.flush()
+
+                print(f"✅ 本次新增 {new_data_count} 条数据，总计 {collected} 条")
 
                 # 检查是否达到目标
-                if len(tools_data) >= target_count:
+                if collected >= target_count:
                     print(f"🎉 达到目标数量 {target_count} 条！")
                     break
 
@@ -167,17 +210,17 @@ def improved_collect_data(target_count=300):
                     # 滚动到底部再稍微回滚
                     print("   📜 滚动到底部后回滚")
                     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(1)
+                    readiness.wait_for_growth(total_rows, timeout=1, learn=False)
                     driver.execute_script("window.scrollBy(0, -300);")
                 else:
                     # 模拟用户缓慢滚动
                     print("   📜 模拟缓慢滚动")
                     for _ in range(3):
                         driver.execute_script("window.scrollBy(0, 1000);")
-                        time.sleep(1)
+                        readiness.wait_for_growth(total_rows, timeout=1, learn=False)
 
-                # 等待内容加载
-                time.sleep(5)
+                # 等待内容加载：行数一增长立即返回
+                readiness.wait_for_growth(total_rows)
 
                 # 检查页面高度是否有变化
                 new_height = driver.execute_script("return document.body.scrollHeight")
@@ -187,30 +230,34 @@ def improved_collect_data(target_count=300):
                 else:
                     print(f"   📏 页面高度未变化: {new_height}")
 
+                if readiness.reached_end:
+                    print("🛑 行数和页面高度多次不再变化，已到列表末尾")
+                    break
+
             except Exception as e:
                 print(f"❌ 采集过程出错: {e}")
                 break
 
-        print(f"\n✅ 改进采集完成！共获取 {len(tools_data)} 条独特数据")
+        print(f"\n✅ 改进采集完成！共获取 {collected} 条独特数据")
 
         # 输出统计信息
-        if tools_data:
+        if collected:
             print("📊 采集统计:")
             print(f"   🎯 目标数量: {target_count}")
-            print(f"   ✅ 实际采集: {len(tools_data)}")
-            print(f"   📈 完成率: {len(tools_data)/target_count*100:.1f}%")
+            print(f"   ✅ 实际采集: {collected}")
+            print(f"   📈 完成率: {collected/target_count*100:.1f}%")
 
             print("\n📋 采集数据样本（前5条）:")
-            for i, tool in enumerate(tools_data[:5]):
+            for i, tool in enumerate(samples):
                 print(f"   {i+1}. {tool.get('tool_name', 'N/A')} - {tool.get('monthly_visits', 'N/A')}")
 
-        return tools_data
+        return collected
 
     except Exception as e:
         print(f"❌ 改进采集出错: {e}")
         import traceback
         print(f"📋 详细错误: {traceback.format_exc()}")
-        return tools_data
+        return collected
 
     finally:
         print("🔚 关闭浏览器...")
@@ -229,18 +276,16 @@ def main():
     target_count = int(os.getenv('INPUT_TARGET_COUNT', '300'))
     print(f"🎯 采集目标: {target_count} 条")
 
-    # 执行改进采集
-    tools_data = improved_collect_data(target_count)
+    # 执行改进采集，边采集边写备份
+    backup = BackupWriter.for_run('improved')
+    collected = improved_collect_data(backup, target_count)
 
-    if not tools_data:
+    if not collected:
         print("💥 改进采集失败，没有获取到数据")
         return
 
-    # 保存备份
-    backup_file = f"./improved-backup-{datetime.now().strftime('%Y-%m-%d-%H%M')}.json"
-    with open(backup_file, 'w', encoding='utf-8') as f:
-        json.dump(tools_data, f, ensure_ascii=False, indent=2)
-    print(f"💾 本地备份已保存: {backup_file}")
+    # 写出汇总行并清理旧备份
+    backup.close()
 
     print("🎉 改进采集任务完成！")
 
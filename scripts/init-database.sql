@@ -1,3 +1,6 @@
+-- 搜索用的三元组索引依赖 pg_trgm
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- 创建工具数据表
 CREATE TABLE IF NOT EXISTS toolify_tools (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -7,10 +10,14 @@ CREATE TABLE IF NOT EXISTS toolify_tools (
     monthly_visits VARCHAR(100), -- 如: "5.8B"
     growth VARCHAR(100), -- 如: "126.6M"
     growth_rate VARCHAR(50), -- 如: "2.21%"
+    monthly_visits_num BIGINT, -- monthly_visits 的数值: 5800000000
+    growth_num BIGINT, -- growth 的数值: 126600000
+    growth_rate_num DOUBLE PRECISION, -- growth_rate 的百分数值: 2.21
     description TEXT,
     tags TEXT, -- 工具标签
     collected_at TIMESTAMP DEFAULT NOW(),
     collection_batch VARCHAR(100),
+    content_hash VARCHAR(64), -- 内容字段的 sha256，增量上传用来跳过未变化的行
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW()
 );
@@ -30,6 +37,17 @@ CREATE TABLE IF NOT EXISTS user_actions (
 CREATE INDEX IF NOT EXISTS idx_toolify_tools_ranking ON toolify_tools(ranking);
 CREATE INDEX IF NOT EXISTS idx_toolify_tools_tool_name ON toolify_tools(tool_name);
 CREATE INDEX IF NOT EXISTS idx_toolify_tools_collected_at ON toolify_tools(collected_at);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_monthly_visits_num ON toolify_tools(monthly_visits_num DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_growth_num ON toolify_tools(growth_num DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_growth_rate_num ON toolify_tools(growth_rate_num DESC NULLS LAST);
+-- 升序排列时空值同样在后（nullsFirst: false），降序索引反向扫描得到的是空值在前，需要单独的升序索引
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_monthly_visits_num_asc ON toolify_tools(monthly_visits_num ASC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_growth_num_asc ON toolify_tools(growth_num ASC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_growth_rate_num_asc ON toolify_tools(growth_rate_num ASC NULLS LAST);
+-- 搜索框的 ILIKE '%关键词%' 走三元组索引（中文描述同样适用，见 add-search-indexes.sql）
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_tool_name_trgm ON toolify_tools USING GIN (tool_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_description_trgm ON toolify_tools USING GIN (description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_toolify_tools_tags_trgm ON toolify_tools USING GIN (tags gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_user_actions_tool_name ON user_actions(tool_name);
 CREATE INDEX IF NOT EXISTS idx_user_actions_action_type ON user_actions(action_type);
 
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+本地 PostgREST 替身 - 用 SQLite 实现本仓库用到的 /rest/v1 子集，离线测试和压测上传路径
+表: toolify_tools / toolify_tool_snapshots / system_settings（带默认设置）/ user_actions，列定义与 SQL 文件一致
+请求: GET/HEAD/POST/PATCH/DELETE，过滤 eq/neq/gt/gte/lt/lte/like/ilike/in/is（可加 not.），
+     select（列名、* 或 count(*)）、order、limit、offset、on_conflict，
+     Prefer: resolution=merge-duplicates|ignore-duplicates、return=representation、count=exact，
+     rpc/upsert_toolify_tools（与 upsert-tools-function.sql 相同的返回值）、rpc/create_toolify_snapshot_partition，
+     gzip 请求体
+错误码与 PostgREST 一致：22001 超长、23502 非空、23505 唯一冲突、PGRST204 未知列、PGRST102 批量行的键不一致
+故障注入（--seed 固定随机序列，结果可复现）:
+     --latency 每个请求的固定延迟(ms)，--jitter 额外随机延迟上限(ms)，--row-latency 每写入一行的延迟(ms)，
+     --error-rate 随机返回 503 的比例，--max-payload 请求体超过该字节数返回 413
+
+用法: python scripts/local-postgrest.py --port 54321 --latency 20 --row-latency 0.5 --error-rate 0.02
+     SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_ANON_KEY=local python scripts/production-collector.py
+"""
+
+import json
+import gzip
+import time
+import uuid
+import random
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# (列名, 类型, VARCHAR 长度, 非空, 默认值) - 默认值 'uuid' / 'now' 在插入时生成
+TABLES = {
+    "toolify_tools": {
+        "columns": [
+            ("id", "uuid", None, True, "uuid"),
+            ("ranking", "integer", None, False, None),
+            ("tool_name", "varchar", 255, True, None),
+            ("tool_url", "varchar", 500, True, None),
+            ("monthly_visits", "varchar", 100, False, None),
+            ("growth", "varchar", 100, False, None),
+            ("growth_rate", "varchar", 50, False, None),
+            ("monthly_visits_num", "integer", None, False, None),
+            ("growth_num", "integer", None, False, None),
+            ("growth_rate_num", "real", None, False, None),
+            ("description", "text", None, False, None),
+            ("tags", "text", None, False, None),
+            ("collected_at", "timestamp", None, False, "now"),
+            ("collection_batch", "varchar", 100, False, None),
+            ("content_hash", "varchar", 64, False, None),
+            ("created_at", "timestamp", None, False, "now"),
+            ("updated_at", "timestamp", None, False, "now"),
+        ],
+        "unique": [("tool_name",)],
+    },
+    "toolify_tool_snapshots": {
+        # 真实表没有 id，这里的 id 只是 SQLite 内部主键；按月分区由 rpc/create_toolify_snapshot_partition 模拟
+        "columns": [
+            ("id", "uuid", None, True, "uuid"),
+            ("tool_name", "varchar", 255, True, None),
+            ("collection_batch", "varchar", 100, True, None),
+            ("batch_date", "date", None, True, None),
+            ("collected_at", "timestamp", None, True, None),
+            ("ranking", "integer", None, False, None),
+            ("tool_url", "varchar", 500, False, None),
+            ("monthly_visits", "varchar", 100, False, None),
+            ("growth", "varchar", 100, False, None),
+            ("growth_rate", "varchar", 50, False, None),
+            ("monthly_visits_num", "integer", None, False, None),
+            ("growth_num", "integer", None, False, None),
+            ("growth_rate_num", "real", None, False, None),
+            ("description", "text", None, False, None),
+            ("tags", "text", None, False, None),
+        ],
+        "unique": [("collection_batch", "tool_name", "batch_date")],
+    },
+    "user_actions": {
+        "columns": [
+            ("id", "uuid", None, True, "uuid"),
+            ("tool_name", "varchar", 255, True, None),
+            ("tool_url", "varchar", 500, True, None),
+            ("action_type", "varchar", 20, True, None),
+            ("created_at", "timestamp", None, False, "now"),
+            ("updated_at", "timestamp", None, False, "now"),
+        ],
+        "unique": [("tool_name", "action_type")],
+    },
+    "system_settings": {
+        "columns": [
+            ("id", "uuid", None, True, "uuid"),
+            ("setting_key", "varchar", 100, True, None),
+            ("setting_value", "text", None, True, None),
+            ("setting_type", "varchar", 50, True, None),
+            ("description", "text", None, False, None),
+            ("created_at", "timestamp", None, False, "now"),
+            ("updated_at", "timestamp", None, False, "now"),
+        ],
+        "unique": [("setting_key",)],
+    },
+}
+
+# 与 create-settings-table-safe.sql 相同的默认设置
+DEFAULT_SETTINGS = [
+    ("collection_target_count", "3000", "number", "数据采集目标数量"),
+    ("collection_enabled", "true", "boolean", "是否启用定时采集"),
+    ("collection_frequency", "monthly", "string", "采集频率: daily, weekly, monthly"),
+    ("collection_day_of_month", "2", "number", "每月采集日期(1-28)"),
+    ("collection_hour", "2", "number", "采集时间(UTC小时,0-23)"),
+    ("last_collection_time", "", "string", "最后一次采集时间"),
+    ("collection_status", "idle", "string", "采集状态: idle, running, completed, failed"),
+    ("max_scroll_attempts", "60", "number", "最大滚动尝试次数"),
+    ("batch_size", "100", "number", "数据库批量插入大小"),
+    ("retry_attempts", "3", "number", "失败重试次数"),
+]
+
+# upsert_toolify_tools 判断“未变化”时比较的内容字段，与 SQL 一致包含 content_hash（旧行的空哈希会被补写）
+RPC_CONTENT_FIELDS = ["ranking", "tool_url", "monthly_visits", "growth", "growth_rate", "description", "tags",
+                      "content_hash"]
+
+SQLITE_TYPES = {"integer": "INTEGER", "real": "REAL"}
+FILTER_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+class ApiError(Exception):
+    """以 PostgREST 错误格式返回给客户端"""
+
+    def __init__(self, status, code, message):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+    def body(self):
+        return {"code": self.code, "details": None, "hint": None, "message": self.message}
+
+
+def now():
+    return datetime.now().isoformat()
+
+
+class Store:
+    """SQLite 存储，单连接 + 锁，所有写操作在一个事务里完成"""
+
+    def __init__(self, path=":memory:"):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA case_sensitive_like = ON")
+        for table, spec in TABLES.items():
+            columns = ", ".join(f'"{name}" {SQLITE_TYPES.get(kind, "TEXT")}' for name, kind, *_ in spec["columns"])
+            uniques = "".join(f", UNIQUE ({', '.join(key)})" for key in spec["unique"])
+            self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns}, PRIMARY KEY (id){uniques})')
+        if not self.conn.execute("SELECT 1 FROM system_settings LIMIT 1").fetchone():
+            self.insert("system_settings", [
+                {"setting_key": key, "setting_value": value, "setting_type": kind, "description": description}
+                for key, value, kind, description in DEFAULT_SETTINGS
+            ], resolution=None, conflict_key=None)
+
+    @staticmethod
+    def spec(table):
+        if table not in TABLES:
+            raise ApiError(404, "42P01", f'relation "public.{table}" does not exist')
+        return TABLES[table]
+
+    @staticmethod
+    def column_names(table):
+        return [name for name, *_ in TABLES[table]["columns"]]
+
+    def check_row(self, table, row, partial=False):
+        """按列定义校验一行：未知列、非空、VARCHAR 长度；补齐默认值"""
+        known = {name: (kind, length, not_null, default) for name, kind, length, not_null, default in TABLES[table]["columns"]}
+        for name in row:
+            if name not in known:
+                raise ApiError(400, "PGRST204", f"Could not find the '{name}' column of '{table}' in the schema cache")
+
+        checked = dict(row)
+        for name, (kind, length, not_null, default) in known.items():
+            if name not in checked:
+                if partial:
+                    continue
+                checked[name] = str(uuid.uuid4()) if default == "uuid" else now() if default == "now" else None
+            value = checked[name]
+            if value is None and not_null:
+                raise ApiError(400, "23502", f'null value in column "{name}" of relation "{table}" violates not-null constraint')
+            if kind == "varchar" and isinstance(value, str) and len(value) > length:
+                raise ApiError(400, "22001", f"value too long for type character varying({length})")
+            if kind in SQLITE_TYPES and value is not None:
+                try:
+                    checked[name] = int(value) if kind == "integer" else float(value)
+                except (TypeError, ValueError):
+                    raise ApiError(400, "22P02", f'invalid input syntax for type {kind}: "{value}"')
+        return checked
+
+    def where_clause(self, table, filters):
+        """PostgREST 过滤参数 -> SQL 条件"""
+        names = self.column_names(table)
+        clauses, params = [], []
+        for column, expression in filters:
+            if column not in names:
+                raise ApiError(400, "42703", f"column {table}.{column} does not exist")
+            negate = expression.startswith("not.")
+            if negate:
+                expression = expression[4:]
+            operator, _, value = expression.partition(".")
+
+            if operator in FILTER_OPERATORS:
+                clause = f'"{column}" {FILTER_OPERATORS[operator]} ?'
+                params.append(value)
+            elif operator in ("like", "ilike"):
+                pattern = value.replace("*", "%")
+                clause = f'"{column}" LIKE ?' if operator == "like" else f'lower("{column}") LIKE lower(?)'
+                params.append(pattern)
+            elif operator == "in":
+                values = [v.strip().strip('"') for v in value.strip("()").split(",")] if value.strip("()") else []
+                clause = f'"{column}" IN ({", ".join("?" for _ in values)})'
+                params.extend(values)
+            elif operator == "is":
+                literal = {"null": "NULL", "true": "1", "false": "0"}.get(value.lower())
+                if literal is None:
+                    raise ApiError(400, "PGRST100", f'"failed to parse filter ({expression})"')
+                clause = f'"{column}" IS {literal}'
+            else:
+                raise ApiError(400, "PGRST100", f'"failed to parse filter ({expression})"')
+
+            clauses.append(f"NOT ({clause})" if negate else clause)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def select(self, table, filters, select="*", order=None, limit=None, offset=None):
+        """返回 (行列表, 满足过滤条件的总行数)"""
+        self.spec(table)
+        where, params = self.where_clause(table, filters)
+        names = self.column_names(table)
+
+        with self.lock:
+            total = self.conn.execute(f'SELECT COUNT(*) FROM "{table}"{where}', params).fetchone()[0]
+            if select.replace(" ", "") in ("count(*)", "count()"):
+                return [{"count": total}], total
+
+            columns = names if select in ("*", "") else [c.strip() for c in select.split(",") if c.strip()]
+            for column in columns:
+                if column not in names:
+                    raise ApiError(400, "42703", f"column {table}.{column} does not exist")
+            sql = f'SELECT {", ".join(chr(34) + c + chr(34) for c in columns)} FROM "{table}"{where}'
+
+            if order:
+                terms = []
+                for term in order.split(","):
+                    parts = term.strip().split(".")
+                    if parts[0] not in names:
+                        raise ApiError(400, "42703", f"column {table}.{parts[0]} does not exist")
+                    direction = "DESC" if "desc" in parts[1:] else "ASC"
+                    nulls = " NULLS FIRST" if "nullsfirst" in parts[1:] else " NULLS LAST" if "nullslast" in parts[1:] else ""
+                    terms.append(f'"{parts[0]}" {direction}{nulls}')
+                sql += " ORDER BY " + ", ".join(terms)
+            if limit is not None or offset is not None:
+                sql += " LIMIT ? OFFSET ?"
+                params = params + [int(limit) if limit is not None else -1, int(offset or 0)]
+
+            rows = [dict(row) for row in self.conn.execute(sql, params)]
+        return rows, total
+
+    def insert(self, table, rows, resolution, conflict_key):
+        """批量插入（整批一个事务）；resolution 为 merge-duplicates / ignore-duplicates / None"""
+        spec = self.spec(table)
+        if not rows:
+            return []
+        keys = set(rows[0])
+        if any(set(row) != keys for row in rows):
+            raise ApiError(400, "PGRST102", "All object keys must match")
+
+        conflict_key = tuple(conflict_key or ("id",))
+        if conflict_key != ("id",) and conflict_key not in spec["unique"]:
+            raise ApiError(400, "42P10", "there is no unique or exclusion constraint matching the ON CONFLICT specification")
+
+        checked = [self.check_row(table, row) for row in rows]
+        written = []
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                for row, original in zip(checked, rows):
+                    existing = self._find(table, conflict_key, row) if resolution else None
+                    if existing is None:
+                        self._insert_row(table, row)
+                        written.append(row)
+                    elif resolution == "merge-duplicates":
+                        # 只更新请求里带的列，与 PostgREST 一致
+                        update = {k: v for k, v in row.items() if k in original and k not in conflict_key}
+                        self._update_row(table, existing["id"], update)
+                        written.append(dict(existing, **update))
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return written
+
+    def _find(self, table, key, row):
+        where = " AND ".join(f'"{column}" = ?' for column in key)
+        found = self.conn.execute(f'SELECT * FROM "{table}" WHERE {where}', [row.get(c) for c in key]).fetchone()
+        return dict(found) if found else None
+
+    def _insert_row(self, table, row):
+        columns = list(row)
+        try:
+            self.conn.execute(
+                f'INSERT INTO "{table}" ({", ".join(chr(34) + c + chr(34) for c in columns)}) '
+                f'VALUES ({", ".join("?" for _ in columns)})',
+                [row[c] for c in columns]
+            )
+        except sqlite3.IntegrityError as e:
+            raise ApiError(409, "23505", f'duplicate key value violates unique constraint "{table}_key" ({e})')
+
+    def _update_row(self, table, row_id, values):
+        if not values:
+            return
+        try:
+            self.conn.execute(
+                f'UPDATE "{table}" SET {", ".join(chr(34) + c + chr(34) + " = ?" for c in values)} WHERE id = ?',
+                list(values.values()) + [row_id]
+            )
+        except sqlite3.IntegrityError as e:
+            raise ApiError(409, "23505", f'duplicate key value violates unique constraint "{table}_key" ({e})')
+
+    def update(self, table, filters, values):
+        self.spec(table)
+        values = self.check_row(table, values, partial=True)
+        where, params = self.where_clause(table, filters)
+        with self.lock:
+            ids = [row["id"] for row in self.conn.execute(f'SELECT id FROM "{table}"{where}', params)]
+            self.conn.execute("BEGIN")
+            try:
+                for row_id in ids:
+                    self._update_row(table, row_id, values)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return len(ids)
+
+    def delete(self, table, filters):
+        self.spec(table)
+        where, params = self.where_clause(table, filters)
+        with self.lock:
+            return self.conn.execute(f'DELETE FROM "{table}"{where}', params).rowcount
+
+    def rpc_upsert_tools(self, tools):
+        """与 upsert_toolify_tools 相同：同名只保留排名最靠前的一条，内容没变的行不写入"""
+        if not isinstance(tools, list):
+            raise ApiError(400, "22023", "cannot call jsonb_to_recordset on a non-array")
+        incoming = {}
+        for tool in sorted(tools, key=lambda t: (t.get("ranking") is None, t.get("ranking") or 0)):
+            incoming.setdefault(tool.get("tool_name"), tool)
+
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        names = set(self.column_names("toolify_tools")) - {"id", "created_at", "updated_at"}
+        checked = [self.check_row("toolify_tools", {k: v for k, v in tool.items() if k in names})
+                   for tool in incoming.values()]
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                for row in checked:
+                    existing = self._find("toolify_tools", ("tool_name",), row)
+                    if existing is None:
+                        self._insert_row("toolify_tools", row)
+                        counts["inserted"] += 1
+                    elif all(existing[f] == row.get(f) for f in RPC_CONTENT_FIELDS):
+                        counts["unchanged"] += 1
+                    else:
+                        update = {k: v for k, v in row.items() if k not in ("id", "tool_name", "created_at")}
+                        update["updated_at"] = now()
+                        self._update_row("toolify_tools", existing["id"], update)
+                        counts["updated"] += 1
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return counts
+
+
+class FaultInjector:
+    """按固定种子注入延迟和错误，同样的请求序列得到同样的结果"""
+
+    def __init__(self, latency=0.0, jitter=0.0, row_latency=0.0, error_rate=0.0, max_payload=None, seed=0):
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.row_latency = row_latency / 1000
+        self.error_rate = error_rate
+        self.max_payload = max_payload
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def draw(self):
+        """返回 (本次请求的延迟秒数, 是否注入 503)"""
+        with self.lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            return delay, self.random.random() < self.error_rate
+
+
+class RestHandler(BaseHTTPRequestHandler):
+    store = None
+    faults = None
+    verbose = False
+    protocol_version = "HTTP/1.1"  # keep-alive，和真实服务一样复用连接
+
+    def log_message(self, fmt, *args):
+        if self.verbose:
+            super().log_message(fmt, *args)
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_HEAD(self):
+        self.handle_request("HEAD")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_PATCH(self):
+        self.handle_request("PATCH")
+
+    def do_DELETE(self):
+        self.handle_request("DELETE")
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.faults.max_payload and length > self.faults.max_payload:
+            raise ApiError(413, "PGRST413", f"Payload Too Large: {length} > {self.faults.max_payload} bytes")
+        if self.headers.get("Content-Encoding", "").lower() == "gzip":
+            raw = gzip.decompress(raw)
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError as e:
+            raise ApiError(400, "PGRST102", f"Empty or invalid json: {e}")
+
+    def send_json(self, status, body=None, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload) if self.command != "HEAD" else 0))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if payload and self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def handle_request(self, method):
+        url = urlsplit(self.path)
+        if not url.path.startswith("/rest/v1/"):
+            self.read_body_quietly()
+            return self.send_json(404, {"message": "not found"})
+
+        delay, inject_error = self.faults.draw()
+        try:
+            body = self.read_body() if method in ("POST", "PATCH") else None
+        except ApiError as e:
+            time.sleep(delay)
+            return self.send_json(e.status, e.body())
+        if inject_error:
+            time.sleep(delay)
+            return self.send_json(503, {"message": "injected failure"})
+
+        resource = url.path[len("/rest/v1/"):].strip("/")
+        params = parse_qsl(url.query, keep_blank_values=True)
+        prefer = {k.strip(): v.strip() for k, _, v in
+                  (token.partition("=") for token in self.headers.get("Prefer", "").split(",") if token.strip())}
+        try:
+            status, result, headers, rows_written = self.dispatch(method, resource, params, body, prefer)
+        except ApiError as e:
+            time.sleep(delay)
+            return self.send_json(e.status, e.body())
+
+        time.sleep(delay + rows_written * self.faults.row_latency)
+        self.send_json(status, result, headers)
+
+    def read_body_quietly(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+    def dispatch(self, method, resource, params, body, prefer):
+        """返回 (状态码, 响应体, 额外响应头, 写入行数)"""
+        if resource.startswith("rpc/"):
+            if method == "POST" and resource == "rpc/upsert_toolify_tools":
+                tools = (body or {}).get("tools")
+                return 200, self.store.rpc_upsert_tools(tools), {}, len(tools or [])
+            if method == "POST" and resource == "rpc/create_toolify_snapshot_partition":
+                # SQLite 不分区，只返回与真实函数相同的分区表名
+                month = str((body or {}).get("p_month") or "")[:7].replace("-", "_")
+                return 200, f"toolify_tool_snapshots_{month}", {}, 0
+            raise ApiError(404, "PGRST202", f"Could not find the function public.{resource[4:]} in the schema cache")
+
+        options = {k: v for k, v in params if k in RESERVED_PARAMS}
+        filters = [(k, v) for k, v in params if k not in RESERVED_PARAMS]
+        representation = prefer.get("return") == "representation"
+
+        if method in ("GET", "HEAD"):
+            rows, total = self.store.select(resource, filters, options.get("select", "*"), options.get("order"),
+                                            options.get("limit"), options.get("offset"))
+            start = int(options.get("offset") or 0)
+            headers = {}
+            if prefer.get("count") == "exact":
+                headers["Content-Range"] = f"{start}-{start + len(rows) - 1}/{total}" if rows else f"*/{total}"
+            return 200, rows, headers, 0
+
+        if method == "POST":
+            rows = body if isinstance(body, list) else [body] if isinstance(body, dict) else []
+            conflict_key = tuple(c.strip() for c in options["on_conflict"].split(",")) if "on_conflict" in options else None
+            written = self.store.insert(resource, rows, prefer.get("resolution"), conflict_key)
+            return 201, written if representation else None, {}, len(rows)
+
+        if method == "PATCH":
+            if not isinstance(body, dict):
+                raise ApiError(400, "PGRST102", "PATCH body must be a json object")
+            count = self.store.update(resource, filters, body)
+            return 204, None, {}, count
+
+        if method == "DELETE":
+            count = self.store.delete(resource, filters)
+            return 204, None, {}, count
+
+        raise ApiError(405, "PGRST117", f"Unsupported HTTP method: {method}")
+
+
+def make_server(port=54321, db_path=":memory:", faults=None, verbose=False, host="127.0.0.1"):
+    """创建服务（未启动），可在其它脚本里放到线程中运行"""
+    handler = type("Handler", (RestHandler,), {
+        "store": Store(db_path),
+        "faults": faults or FaultInjector(),
+        "verbose": verbose,
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地 PostgREST 替身（SQLite）")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--db", default=":memory:", help="SQLite 文件路径，默认内存库")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的固定延迟(ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="额外随机延迟上限(ms)")
+    parser.add_argument("--row-latency", type=float, default=0.0, help="每写入一行的额外延迟(ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="随机返回 503 的比例(0-1)")
+    parser.add_argument("--max-payload", type=int, default=None, help="请求体字节上限，超过返回 413")
+    parser.add_argument("--seed", type=int, default=0, help="故障注入随机种子")
+    parser.add_argument("--verbose", action="store_true", help="打印每个请求")
+    args = parser.parse_args()
+
+    faults = FaultInjector(args.latency, args.jitter, args.row_latency, args.error_rate, args.max_payload, args.seed)
+    server = make_server(args.port, args.db, faults, args.verbose, args.host)
+    print(f"🚀 本地 PostgREST 替身已启动: http://{args.host}:{args.port}（数据库 {args.db}）")
+    print(f"   延迟 {args.latency}ms + 抖动 {args.jitter}ms + 每行 {args.row_latency}ms，"
+          f"错误率 {args.error_rate:.0%}，请求体上限 {args.max_payload or '不限'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 已停止")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+离线解析 page_source - 不经过 WebDriver 提取表格行
+结构与 DOM 提取一致：tr.el-table__row / .go-tool / td span / td p
+安装了 lxml 时使用 lxml，否则退化为标准库 HTMLParser
+
+用法: python scripts/page_parser.py saved-page.html
+"""
+
+import sys
+import json
+from html.parser import HTMLParser
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# 与 BULK_EXTRACT_JS 相同的列定义：(字段, td 下标, 取值标签)
+CELL_FIELDS = [
+    ("monthly_visits", 2, "span"),
+    ("growth", 3, "span"),
+    ("growth_rate", 4, "span"),
+    ("description", 5, "p"),
+    ("tags", 6, "p"),
+]
+
+ROW_XPATH = "//tr[contains(concat(' ', normalize-space(@class), ' '), ' el-table__row ')]"
+LINK_XPATH = ".//*[contains(concat(' ', normalize-space(@class), ' '), ' go-tool ')]"
+
+
+def clean_text(text):
+    """合并空白，接近 innerText 的效果"""
+    return " ".join(text.split())
+
+
+def parse_rows_lxml(html, start_index=0):
+    """lxml 解析"""
+    tree = lxml.html.fromstring(html)
+    rows = tree.xpath(ROW_XPATH)
+    raw_rows = []
+
+    for i, row in enumerate(rows[start_index:], start=start_index):
+        links = row.xpath(LINK_XPATH)
+        if not links:
+            raw_rows.append({"index": i, "error": "未找到 .go-tool"})
+            continue
+
+        cells = row.xpath("./td")
+        raw_row = {
+            "index": i,
+            "tool_name": clean_text(links[0].text_content()),
+            "tool_url": links[0].get("href") or ""
+        }
+        try:
+            for field, idx, tag in CELL_FIELDS:
+                if len(cells) <= idx:
+                    raw_row[field] = ""
+                    continue
+                found = cells[idx].xpath(f".//{tag}")
+                if not found:
+                    raise ValueError(f"td[{idx}] 缺少 {tag}")
+                raw_row[field] = clean_text(found[0].text_content())
+        except ValueError as e:
+            raw_rows.append({"index": i, "error": str(e)})
+            continue
+
+        raw_rows.append(raw_row)
+
+    return len(rows), raw_rows
+
+
+class _TableRowParser(HTMLParser):
+    """标准库回退解析器：逐标签跟踪行、单元格和目标元素的文本"""
+
+    VOID_TAGS = {"br", "img", "input", "hr", "meta", "link", "col", "source", "wbr"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self.row = None          # 当前行：{"link": ..., "cells": [...]}
+        self.row_depth = 0
+        self.capture = None      # 当前正在收集文本的目标：[文本片段列表, 结束深度]
+        self.depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.VOID_TAGS:
+            return
+        self.depth += 1
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+
+        if tag == "tr" and "el-table__row" in classes and self.row is None:
+            self.row = {"link": None, "href": "", "cells": []}
+            self.row_depth = self.depth
+            return
+        if self.row is None:
+            return
+
+        if tag == "td":
+            self.row["cells"].append({"span": None, "p": None})
+        if self.capture is not None:
+            return
+
+        if "go-tool" in classes and self.row["link"] is None:
+            self.row["link"] = []
+            self.row["href"] = attrs.get("href") or ""
+            self.capture = [self.row["link"], self.depth]
+        elif tag in ("span", "p") and self.row["cells"] and self.row["cells"][-1][tag] is None:
+            self.row["cells"][-1][tag] = []
+            self.capture = [self.row["cells"][-1][tag], self.depth]
+
+    def handle_endtag(self, tag):
+        if tag in self.VOID_TAGS:
+            return
+        if self.capture is not None and self.depth == self.capture[1]:
+            self.capture = None
+        if self.row is not None and self.depth == self.row_depth:
+            self.rows.append(self.row)
+            self.row = None
+        self.depth -= 1
+
+    def handle_data(self, data):
+        if self.capture is not None:
+            self.capture[0].append(data)
+
+
+def parse_rows_stdlib(html, start_index=0):
+    """标准库解析"""
+    parser = _TableRowParser()
+    parser.feed(html)
+    parser.close()
+    raw_rows = []
+
+    for i, row in enumerate(parser.rows[start_index:], start=start_index):
+        if row["link"] is None:
+            raw_rows.append({"index": i, "error": "未找到 .go-tool"})
+            continue
+
+        cells = row["cells"]
+        raw_row = {
+            "index": i,
+            "tool_name": clean_text("".join(row["link"])),
+            "tool_url": row["href"]
+        }
+        missing = None
+        for field, idx, tag in CELL_FIELDS:
+            if len(cells) <= idx:
+                raw_row[field] = ""
+            elif cells[idx][tag] is None:
+                missing = f"td[{idx}] 缺少 {tag}"
+                break
+            else:
+                raw_row[field] = clean_text("".join(cells[idx][tag]))
+
+        raw_rows.append({"index": i, "error": missing} if missing else raw_row)
+
+    return len(parser.rows), raw_rows
+
+
+def parse_rows(html, start_index=0):
+    """解析 page_source，返回 (总行数, 第 start_index 行起的原始行列表)"""
+    if HAS_LXML:
+        return parse_rows_lxml(html, start_index)
+    return parse_rows_stdlib(html, start_index)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("用法: python scripts/page_parser.py <saved-page.html>")
+        sys.exit(1)
+
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        total, rows = parse_rows(f.read())
+
+    print(f"解析器: {'lxml' if HAS_LXML else 'html.parser'}，共 {total} 行")
+    print(json.dumps(rows[:5], ensure_ascii=False, indent=2))
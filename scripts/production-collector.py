@@ -7,14 +7,22 @@ print("📦 开始导入模块...")
 
 import os
 print("✅ os 模块导入成功")
+import sys
+print("✅ sys 模块导入成功")
 import time
 print("✅ time 模块导入成功")
 import json
 print("✅ json 模块导入成功")
 import requests
 print("✅ requests 模块导入成功")
+import re
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+print("✅ concurrent.futures 模块导入成功")
 from datetime import datetime
 print("✅ datetime 模块导入成功")
+from urllib.parse import urlsplit
 
 # 延迟导入Selenium相关模块，添加详细调试
 try:
@@ -41,10 +49,110 @@ except Exception as e:
     print(f"❌ webdriver_manager导入失败: {e}")
     exit(1)
 
+from scroll_readiness import ScrollReadiness
+print("✅ scroll_readiness 模块导入成功")
+from toolify_records import find_tool_records, record_to_raw_row, numeric_metrics, batch_date, parse_ranking
+print("✅ toolify_records 模块导入成功")
+from page_parser import parse_rows, HAS_LXML
+print("✅ page_parser 模块导入成功")
+from collection_journal import CollectionJournal, DeadLetterFile, load_journal, latest_journal
+print("✅ collection_journal 模块导入成功")
+from supabase_rest import client_from_env
+print("✅ supabase_rest 模块导入成功")
+
+from tool_hashes import content_hash, fetch_existing_hashes, split_changed
+print("✅ tool_hashes 模块导入成功")
+from collection_backup import BackupWriter
+print("✅ collection_backup 模块导入成功")
+
 print("🎯 所有模块导入完成，开始定义函数...")
 
-def setup_driver():
-    """设置Chrome浏览器 - 生产环境优化版本"""
+DEFAULT_LISTING_URL = "https://www.toolify.ai/zh/Best-trending-AI-Tools"
+
+# 分片模式默认采集的榜单，可用 COLLECTOR_SHARDS（逗号分隔）覆盖
+DEFAULT_SHARD_URLS = [
+    "https://www.toolify.ai/zh/Best-trending-AI-Tools",
+    "https://www.toolify.ai/Best-trending-AI-Tools",
+]
+
+# 资源拦截默认黑名单：图片、字体、音视频和统计/广告脚本，均不影响表格数据
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.com*", "*facebook.net*",
+    "*hotjar.com*", "*clarity.ms*", "*baidu.com/hm.js*",
+]
+
+# 批量提取脚本：一次 execute_script 往返取回第 start 行之后的所有行
+# 字段结构与逐元素提取保持一致（cells[2..4] 取 span，cells[5..6] 取 p）
+BULK_EXTRACT_JS = """
+const start = arguments[0];
+const limit = arguments[1];
+const rows = document.querySelectorAll('tr.el-table__row');
+const end = Math.min(rows.length, start + limit);
+const cellText = (cells, idx, tag) => {
+    if (cells.length <= idx) return '';
+    const el = cells[idx].querySelector(tag);
+    if (!el) throw new Error('td[' + idx + '] 缺少 ' + tag);
+    return el.innerText.trim();
+};
+const result = [];
+for (let i = start; i < end; i++) {
+    try {
+        const row = rows[i];
+        const link = row.querySelector('.go-tool');
+        if (!link) throw new Error('未找到 .go-tool');
+        const cells = row.querySelectorAll('td');
+        result.push({
+            index: i,
+            tool_name: link.innerText.trim(),
+            tool_url: link.href || link.getAttribute('href') || '',
+            monthly_visits: cellText(cells, 2, 'span'),
+            growth: cellText(cells, 3, 'span'),
+            growth_rate: cellText(cells, 4, 'span'),
+            description: cellText(cells, 5, 'p'),
+            tags: cellText(cells, 6, 'p')
+        });
+    } catch (e) {
+        result.push({index: i, error: String(e && e.message || e)});
+    }
+}
+return {total: rows.length, rows: result};
+"""
+
+def _url_pattern_regex(pattern):
+    """按 Network.setBlockedURLs 的规则匹配：整个地址匹配，只有 * 是通配符，其余按字面且区分大小写"""
+    return re.compile('.*'.join(re.escape(part) for part in pattern.split('*')))
+
+def get_blocked_url_patterns():
+    """资源拦截名单：默认黑名单 + BLOCK_URL_DENY，去掉会拦住 BLOCK_URL_ALLOW 的模式（均为逗号分隔）
+
+    setBlockedURLs 只能拦截、不能放行，所以放行一个地址只能去掉匹配它的拦截模式；
+    放行项可以是完整地址、域名或路径（如 cdn.toolify.ai/logo.png），也可以直接写要去掉的模式（如 *.svg）
+    """
+    deny = [p.strip() for p in os.getenv('BLOCK_URL_DENY', '').split(',') if p.strip()]
+    allow = [p.strip() for p in os.getenv('BLOCK_URL_ALLOW', '').split(',') if p.strip()]
+    patterns = []
+    for pattern in DEFAULT_BLOCKED_URL_PATTERNS + deny:
+        regex = _url_pattern_regex(pattern)
+        allowed = [entry for entry in allow if regex.fullmatch(entry)]
+        if allowed:
+            print(f"✅ 放行 {', '.join(allowed)}: 不再拦截 {pattern}")
+        else:
+            patterns.append(pattern)
+    return patterns
+
+def setup_driver(capture_network=False, block_resources=None):
+    """设置Chrome浏览器 - 生产环境优化版本
+
+    capture_network=True 时开启 performance 日志，用于抓取滚动加载的 JSON 响应
+    block_resources=True 时拦截图片、字体、音视频和统计脚本，未指定时读取 BLOCK_RESOURCES
+    """
+    if block_resources is None:
+        block_resources = os.getenv('BLOCK_RESOURCES', '').strip().lower() in ('1', 'true', 'yes')
+
     print("🔧 开始设置Chrome浏览器...")
 
     options = webdriver.ChromeOptions()
@@ -59,6 +167,9 @@ def setup_driver():
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--lang=zh-CN")
 
+    # DOMContentLoaded 即返回，表格行由就绪等待层判断
+    options.page_load_strategy = "eager"
+
     # 反检测设置
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_argument("--disable-extensions")
@@ -69,6 +180,14 @@ def setup_driver():
     user_agent = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     options.add_argument(f"--user-agent={user_agent}")
 
+    if block_resources:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+
+    if capture_network:
+        # 开启 DevTools 网络事件日志（Network.responseReceived 等）
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        print("📡 已开启网络抓包日志")
+
     print("✅ Chrome选项配置完成")
 
     try:
@@ -104,6 +223,13 @@ def setup_driver():
         service = Service(driver_path)
         driver = webdriver.Chrome(service=service, options=options)
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+
+        if block_resources:
+            blocked_patterns = get_blocked_url_patterns()
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_patterns})
+            print(f"🚫 已拦截 {len(blocked_patterns)} 类资源请求")
+
         print("✅ Chrome浏览器启动成功")
         return driver
 
@@ -140,13 +266,7 @@ def get_settings_from_db():
         print(f"🔗 连接数据库: {url[:50]}...")
         print(f"🔑 密钥长度: {len(key)} 字符")
 
-        headers = {
-            'apikey': key,
-            'Authorization': f'Bearer {key}',
-            'Content-Type': 'application/json'
-        }
-
-        response = requests.get(f'{url}/rest/v1/system_settings', headers=headers, timeout=30)
+        response = get_supabase_client().get('system_settings', timeout=30)
 
         if response.status_code == 200:
             settings_data = response.json()
@@ -190,10 +310,122 @@ def get_settings_from_db():
             'retry_attempts': 3
         }
 
-def collect_toolify_data(target_count=300, max_scroll_attempts=10):
-    """采集Toolify数据 - 简化版"""
+# 掏空已提取的行：保留 <tr> 本身（Vue 渲染依赖它作为锚点，行号也不变），
+# 固定其高度以保持滚动高度，清空单元格内容释放渲染内存
+# anchor 是最后交给 on_rows 的行 {index, name}：该行的工具名对不上说明表格重新渲染、行号已偏移，返回 -1 不做清理
+PRUNE_ROWS_JS = """
+const end = arguments[0];
+const anchor = arguments[1];
+const rows = document.querySelectorAll('tr.el-table__row');
+if (anchor) {
+    const link = rows[anchor.index] && rows[anchor.index].querySelector('.go-tool');
+    if (!link || link.innerText.trim() !== anchor.name) return -1;
+}
+const start = window.__toolifyPrunedUpTo || 0;
+const stop = Math.min(end, rows.length);
+const heights = [];
+for (let i = start; i < stop; i++) heights.push(rows[i].offsetHeight);
+for (let i = start; i < stop; i++) {
+    const row = rows[i];
+    row.style.height = heights[i - start] + 'px';
+    for (const cell of row.children) cell.replaceChildren();
+    row.classList.add('toolify-pruned');
+}
+window.__toolifyPrunedUpTo = Math.max(start, stop);
+return window.__toolifyPrunedUpTo;
+"""
+
+def prune_extracted_rows(driver, up_to, anchor=None):
+    """掏空第 up_to 行之前已提取的行，返回已掏空的行数；anchor 校验不通过时不清理，返回 0"""
+    try:
+        pruned = driver.execute_script(PRUNE_ROWS_JS, up_to, anchor)
+        if pruned == -1:
+            print("⚠️ 表格行已变动，跳过本次清理")
+            return 0
+        return pruned
+    except Exception as e:
+        print(f"⚠️ 清理已提取行失败: {e}")
+        return 0
+
+def build_tool_data(raw_row, ranking, collection_batch):
+    """把提取到的原始行字段转换成 tool_data 结构（附带 *_num 数值列和 content_hash）
+
+    每种上传模式都写入 content_hash，库中的哈希始终与内容一致，增量上传才不会误跳过
+    """
+    tool_url = raw_row.get("tool_url") or ""
+    tool = {
+        "ranking": ranking,
+        "tool_name": raw_row.get("tool_name", ""),
+        "tool_url": f"https://www.toolify.ai{tool_url}" if tool_url.startswith("/") else tool_url,
+        "monthly_visits": raw_row.get("monthly_visits", ""),
+        "growth": raw_row.get("growth", ""),
+        "growth_rate": raw_row.get("growth_rate", ""),
+        "description": raw_row.get("description", ""),
+        "tags": raw_row.get("tags", ""),
+        **numeric_metrics(raw_row),
+        "collected_at": datetime.now().isoformat(),
+        "collection_batch": collection_batch
+    }
+    tool["content_hash"] = content_hash(tool)
+    return tool
+
+def extract_rows_bulk(driver, start_index, limit):
+    """批量提取：一次 execute_script 返回第 start_index 行起的原始行数据"""
+    result = driver.execute_script(BULK_EXTRACT_JS, start_index, limit)
+    if not isinstance(result, dict) or 'rows' not in result:
+        raise ValueError(f"批量提取脚本返回异常: {type(result).__name__}")
+    return result['total'], result['rows']
+
+def extract_rows_per_element(driver, start_index, limit):
+    """逐元素提取（原有路径），每行约9次WebDriver往返，作为批量提取的回退"""
+    current_rows = driver.find_elements(By.CSS_SELECTOR, "tr.el-table__row")
+    raw_rows = []
+
+    for i in range(start_index, min(len(current_rows), start_index + limit)):
+        try:
+            row = current_rows[i]
+
+            tool_link = row.find_element(By.CSS_SELECTOR, ".go-tool")
+            cells = row.find_elements(By.TAG_NAME, "td")
+
+            raw_rows.append({
+                "index": i,
+                "tool_name": tool_link.text.strip(),
+                "tool_url": tool_link.get_attribute("href") or "",
+                "monthly_visits": cells[2].find_element(By.TAG_NAME, "span").text.strip() if len(cells) > 2 else "",
+                "growth": cells[3].find_element(By.TAG_NAME, "span").text.strip() if len(cells) > 3 else "",
+                "growth_rate": cells[4].find_element(By.TAG_NAME, "span").text.strip() if len(cells) > 4 else "",
+                "description": cells[5].find_element(By.TAG_NAME, "p").text.strip() if len(cells) > 5 else "",
+                "tags": cells[6].find_element(By.TAG_NAME, "p").text.strip() if len(cells) > 6 else ""
+            })
+        except Exception as e:
+            raw_rows.append({"index": i, "error": str(e)})
+
+    return len(current_rows), raw_rows
+
+def extract_rows(driver, start_index, limit):
+    """提取第 start_index 行之后的数据，批量脚本失败时回退到逐元素路径"""
+    try:
+        return extract_rows_bulk(driver, start_index, limit)
+    except Exception as e:
+        print(f"⚠️ 批量提取失败，回退到逐元素提取: {e}")
+        return extract_rows_per_element(driver, start_index, limit)
+
+def collect_toolify_data(target_count=300, max_scroll_attempts=10, url=DEFAULT_LISTING_URL,
+                         prune_rows=None, prune_keep_tail=20, on_rows=None, start_index=0):
+    """采集Toolify数据 - 简化版
+
+    prune_rows=True 时每次提取后掏空已提取的行（保留最后 prune_keep_tail 行），
+    让长时间滚动时的渲染内存保持平稳；未指定时读取 PRUNE_DOM。
+    只在 on_rows 返回（行已写入断点日志和备份）之后清理，并先核对行号没有因重新渲染而偏移
+    on_rows 每轮提取后收到本轮新增的 tool_data 列表（用于流式上传）
+    start_index 跳过前面已采集的行（断点续采），排名仍按页面行号计算
+    """
     print(f"🚀 开始采集最多 {target_count} 条工具数据...")
 
+    if prune_rows is None:
+        prune_rows = os.getenv('PRUNE_DOM', '').strip().lower() in ('1', 'true', 'yes')
+
     driver = setup_driver()
     if not driver:
         print("❌ 浏览器启动失败")
@@ -202,12 +434,12 @@ def collect_toolify_data(target_count=300, max_scroll_attempts=10):
     tools_data = []
 
     try:
-        url = "https://www.toolify.ai/zh/Best-trending-AI-Tools"
         print(f"📱 正在访问: {url}")
 
         driver.get(url)
-        print("⏳ 等待页面完全加载...")
-        time.sleep(8)
+        print("⏳ 等待表格数据出现...")
+        readiness = ScrollReadiness(driver)
+        readiness.wait_for_rows()
 
         # 检查页面是否正确加载
         page_title = driver.title
@@ -216,52 +448,49 @@ def collect_toolify_data(target_count=300, max_scroll_attempts=10):
         # 简化的数据采集 - 只采集当前页面的数据
         print("🔍 开始数据采集...")
 
+        collection_batch = f"github-actions-{datetime.now().strftime('%Y-%m-%d')}"
+        next_index = start_index  # 下一个待处理的行号，失败行也会被跳过，避免排名错位
+        if start_index:
+            print(f"⏩ 断点续采：从第 {start_index + 1} 行开始")
+
         for attempt in range(max_scroll_attempts):
             try:
                 print(f"📊 第{attempt + 1}次尝试采集数据...")
 
-                current_rows = driver.find_elements(By.CSS_SELECTOR, "tr.el-table__row")
-                print(f"🔍 发现 {len(current_rows)} 行数据")
+                # 一次往返取回 next_index 之后的所有行
+                total_rows, raw_rows = extract_rows(driver, next_index, target_count - len(tools_data))
+                print(f"🔍 发现 {total_rows} 行数据")
 
-                if not current_rows:
+                if total_rows == 0:
                     print("⚠️ 未找到数据行，尝试滚动...")
                     driver.execute_script("window.scrollBy(0, 1000);")
-                    time.sleep(3)
+                    readiness.wait_for_rows()
                     continue
 
                 # 提取数据
                 initial_count = len(tools_data)
-                for i in range(len(tools_data), min(len(current_rows), target_count)):
-                    try:
-                        row = current_rows[i]
-
-                        # 提取工具数据
-                        tool_link = row.find_element(By.CSS_SELECTOR, ".go-tool")
-                        tool_name = tool_link.text.strip()
-                        tool_url = tool_link.get_attribute("href")
-
-                        cells = row.find_elements(By.TAG_NAME, "td")
-
-                        tool_data = {
-                            "ranking": i + 1,
-                            "tool_name": tool_name,
-                            "tool_url": f"https://www.toolify.ai{tool_url}" if tool_url.startswith("/") else tool_url,
-                            "monthly_visits": cells[2].find_element(By.TAG_NAME, "span").text.strip() if len(cells) > 2 else "",
-                            "growth": cells[3].find_element(By.TAG_NAME, "span").text.strip() if len(cells) > 3 else "",
-                            "growth_rate": cells[4].find_element(By.TAG_NAME, "span").text.strip() if len(cells) > 4 else "",
-                            "description": cells[5].find_element(By.TAG_NAME, "p").text.strip() if len(cells) > 5 else "",
-                            "tags": cells[6].find_element(By.TAG_NAME, "p").text.strip() if len(cells) > 6 else "",
-                            "collected_at": datetime.now().isoformat(),
-                            "collection_batch": f"github-actions-{datetime.now().strftime('%Y-%m-%d')}"
-                        }
-
-                        tools_data.append(tool_data)
-
-                        if len(tools_data) % 20 == 0:
-                            print(f"📊 已采集 {len(tools_data)} 条数据...")
-
-                    except Exception as e:
-                        print(f"❌ 提取第{i+1}行数据失败: {e}")
+                for raw_row in raw_rows:
+                    i = raw_row["index"]
+                    next_index = i + 1
+
+                    if "error" in raw_row:
+                        print(f"❌ 提取第{i+1}行数据失败: {raw_row['error']}")
+                        continue
+
+                    tools_data.append(build_tool_data(raw_row, i + 1, collection_batch))
+
+                    if len(tools_data) % 20 == 0:
+                        print(f"📊 已采集 {len(tools_data)} 条数据...")
+
+                new_rows = tools_data[initial_count:]
+                if on_rows and new_rows:
+                    on_rows(new_rows)  # 抛出异常时不会走到下面的清理
+
+                # 已交给 on_rows 的行不再需要，掏空以释放内存；保留末尾几行不影响滚动加载
+                # 以本轮最后一行为锚点核对行号，本轮没有新行时不清理
+                if prune_rows and new_rows and next_index > prune_keep_tail:
+                    anchor = {"index": new_rows[-1]["ranking"] - 1, "name": new_rows[-1]["tool_name"]}
+                    prune_extracted_rows(driver, next_index - prune_keep_tail, anchor)
 
                 # 检查是否达到目标
                 if len(tools_data) >= target_count:
@@ -272,7 +501,11 @@ def collect_toolify_data(target_count=300, max_scroll_attempts=10):
                 if len(tools_data) == initial_count:
                     print("🔄 滚动页面加载更多数据...")
                     driver.execute_script("window.scrollBy(0, 2000);")
-                    time.sleep(4)
+                    readiness.wait_for_growth(total_rows)
+
+                    if readiness.reached_end:
+                        print("🛑 行数和页面高度多次不再变化，已到列表末尾")
+                        break
 
             except Exception as e:
                 print(f"❌ 采集过程出错: {e}")
@@ -301,138 +534,1086 @@ def collect_toolify_data(target_count=300, max_scroll_attempts=10):
         except:
             pass
 
-def upload_to_supabase(tools_data):
-    """上传数据到Supabase - 简化版"""
-    if not tools_data:
-        print("❌ 没有数据需要上传")
-        return False
+def drain_network_json(driver, pending, url_pattern):
+    """读取 performance 日志，返回新完成的 JSON 响应 [(url, payload)]
 
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_ANON_KEY')
+    pending 记录已收到响应头但 body 尚未取到的 requestId，跨多次调用保留
+    """
+    payloads = []
 
-    if not url or not key:
-        print("❌ Supabase配置缺失")
-        return False
+    for entry in driver.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+
+        method = message.get("method")
+        params = message.get("params", {})
+
+        if method == "Network.responseReceived":
+            response = params.get("response", {})
+            if "json" in response.get("mimeType", "") and url_pattern in response.get("url", ""):
+                pending[params["requestId"]] = response["url"]
+        elif method == "Network.loadingFinished" and params.get("requestId") in pending:
+            request_id = params["requestId"]
+            url = pending.pop(request_id)
+            try:
+                body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                payloads.append((url, json.loads(body["body"])))
+            except Exception as e:
+                print(f"⚠️ 读取响应体失败 {url[:80]}: {e}")
 
-    # 清理环境变量
-    url = url.strip()
-    key = key.strip()
+    return payloads
 
-    print(f"📤 准备上传 {len(tools_data)} 条数据...")
+def cross_check_with_dom(driver, tools_data, sample_size=50):
+    """用 DOM 批量提取抽查网络抓包结果的名称和排名"""
+    try:
+        _, raw_rows = extract_rows_bulk(driver, 0, sample_size)
+    except Exception as e:
+        print(f"⚠️ DOM 抽查失败: {e}")
+        return
+
+    dom_names = [row["tool_name"] for row in raw_rows if "error" not in row]
+    captured_names = [tool["tool_name"] for tool in tools_data[:len(dom_names)]]
+    mismatches = [
+        (i + 1, dom, captured)
+        for i, (dom, captured) in enumerate(zip(dom_names, captured_names))
+        if dom != captured
+    ]
+
+    if mismatches:
+        print(f"⚠️ DOM 抽查发现 {len(mismatches)}/{len(dom_names)} 条排名不一致，例如: {mismatches[:3]}")
+    else:
+        print(f"✅ DOM 抽查前 {len(dom_names)} 条与抓包结果一致")
+
+def network_capture_pattern():
+    """抓包只处理地址包含该片段的 JSON 响应：NETWORK_CAPTURE_PATTERN，未设置时取 TOOLIFY_PAGE_URL 的路径
+
+    只匹配榜单接口：站内的配置、多语言、统计等 JSON 响应每条都要一次 getResponseBody 往返。
+    两者都没有时返回 None；需要先找出接口地址时可临时设置 NETWORK_CAPTURE_PATTERN=toolify.ai
+    """
+    pattern = os.getenv('NETWORK_CAPTURE_PATTERN', '').strip()
+    if pattern:
+        return pattern
+    path = urlsplit(os.getenv('TOOLIFY_PAGE_URL', '').strip()).path.split('{')[0].rstrip('/')
+    return path or None
+
+def collect_toolify_data_network(target_count=300, max_scroll_attempts=10, on_rows=None):
+    """采集Toolify数据 - 网络抓包模式，直接解析滚动加载的 JSON 响应
+
+    on_rows 每次解析完一批响应后收到新增的 tool_data 列表（用于流式上传）
+    """
+    url_pattern = network_capture_pattern()
+    if not url_pattern:
+        print("⚠️ 未配置 NETWORK_CAPTURE_PATTERN 或 TOOLIFY_PAGE_URL，无法确定榜单接口，不使用网络抓包模式")
+        return []
 
-    # 验证数据格式
-    print("🔍 验证数据格式...")
-    for i, tool in enumerate(tools_data[:3]):  # 检查前3条
-        required_fields = ['tool_name', 'tool_url', 'ranking']
-        missing_fields = [field for field in required_fields if not tool.get(field)]
-        if missing_fields:
-            print(f"⚠️ 第{i+1}条数据缺少字段: {missing_fields}")
+    print(f"🚀 开始网络抓包采集，目标 {target_count} 条（匹配 {url_pattern}）...")
+
+    driver = setup_driver(capture_network=True)
+    if not driver:
+        print("❌ 浏览器启动失败")
+        return []
+
+    collection_batch = f"github-actions-{datetime.now().strftime('%Y-%m-%d')}"
+    tools_data = []
+    seen_tools = set()
+    pending = {}
+
+    def absorb(payloads):
+        initial_count = len(tools_data)
+        for url, payload in payloads:
+            records = find_tool_records(payload)
+            if records:
+                print(f"📡 {url[:80]} -> {len(records)} 条记录")
+            for record in records:
+                raw_row = record_to_raw_row(record)
+                if raw_row["tool_name"] in seen_tools or len(tools_data) >= target_count:
+                    continue
+                seen_tools.add(raw_row["tool_name"])
+                ranking = parse_ranking(raw_row["ranking"], len(tools_data) + 1)
+                tools_data.append(build_tool_data(raw_row, ranking, collection_batch))
+        if on_rows and len(tools_data) > initial_count:
+            on_rows(tools_data[initial_count:])
+
+    try:
+        url = DEFAULT_LISTING_URL
+        print(f"📱 正在访问: {url}")
+
+        driver.get(url)
+        readiness = ScrollReadiness(driver)
+        row_count = readiness.wait_for_rows()
+        absorb(drain_network_json(driver, pending, url_pattern))
+
+        for attempt in range(max_scroll_attempts):
+            if len(tools_data) >= target_count:
+                print(f"🎉 已达到目标数量 {target_count} 条！")
+                break
+
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            row_count = readiness.wait_for_growth(row_count)
+            absorb(drain_network_json(driver, pending, url_pattern))
+            print(f"📊 第{attempt + 1}次滚动，已抓取 {len(tools_data)} 条，页面 {row_count} 行")
+
+            if readiness.reached_end:
+                print("🛑 行数和页面高度多次不再变化，已到列表末尾")
+                break
+
+        if tools_data:
+            cross_check_with_dom(driver, tools_data)
         else:
-            print(f"✅ 第{i+1}条数据格式正确: {tool['tool_name']}")
+            print("⚠️ 未从网络响应中解析到工具记录")
 
-    # 测试连接
-    headers = {
-        'apikey': key,
-        'Authorization': f'Bearer {key}',
-        'Content-Type': 'application/json'
-    }
+        print(f"✅ 抓包采集完成！共获取 {len(tools_data)} 条数据")
+        return tools_data[:target_count]
+
+    except Exception as e:
+        print(f"❌ 抓包采集出错: {e}")
+        import traceback
+        print(f"📋 详细错误: {traceback.format_exc()}")
+        return tools_data
+
+    finally:
+        print("🔚 关闭浏览器...")
+        try:
+            driver.quit()
+        except:
+            pass
+
+def collect_toolify_data_pagesource(target_count=300, max_scroll_attempts=10, scrolls_per_burst=3, on_rows=None):
+    """采集Toolify数据 - page_source 模式
+
+    每轮滚动后只取一次 driver.page_source，由后台线程离线解析，
+    解析与下一轮滚动重叠进行；on_rows 在解析线程中收到每份快照新增的 tool_data 列表
+    """
+    print(f"🚀 开始 page_source 采集，目标 {target_count} 条（解析器: {'lxml' if HAS_LXML else 'html.parser'}）...")
+
+    driver = setup_driver()
+    if not driver:
+        print("❌ 浏览器启动失败")
+        return []
+
+    collection_batch = f"github-actions-{datetime.now().strftime('%Y-%m-%d')}"
+    tools_data = []
+    html_queue = queue.Queue(maxsize=2)  # 解析跟不上时让滚动等待，避免堆积大量页面快照
+
+    def parse_worker():
+        next_index = 0
+        while True:
+            html = html_queue.get()
+            if html is None:
+                break
+            try:
+                _, raw_rows = parse_rows(html, next_index)
+            except Exception as e:
+                print(f"❌ 解析 page_source 失败: {e}")
+                continue
+            initial_count = len(tools_data)
+            for raw_row in raw_rows:
+                i = raw_row["index"]
+                next_index = i + 1
+                if len(tools_data) >= target_count:
+                    break
+                if "error" in raw_row:
+                    print(f"❌ 提取第{i+1}行数据失败: {raw_row['error']}")
+                    continue
+                tools_data.append(build_tool_data(raw_row, i + 1, collection_batch))
+            print(f"📊 已解析 {len(tools_data)} 条数据...")
+            if on_rows and len(tools_data) > initial_count:
+                try:
+                    on_rows(tools_data[initial_count:])
+                except Exception as e:
+                    # 解析线程退出后滚动会阻塞在 html_queue 上；这批行在采集结束后随返回值补交
+                    print(f"❌ 提交新解析的行失败: {e}")
+
+    worker = threading.Thread(target=parse_worker, daemon=True)
+    worker.start()
 
+    try:
+        url = DEFAULT_LISTING_URL
+        print(f"📱 正在访问: {url}")
+
+        driver.get(url)
+        readiness = ScrollReadiness(driver)
+        row_count = readiness.wait_for_rows()
+
+        for attempt in range(max_scroll_attempts):
+            html_queue.put(driver.page_source)
+
+            if len(tools_data) >= target_count or row_count >= target_count:
+                print(f"🎉 页面已加载足够的行（{row_count}）")
+                break
+
+            # 一轮连续滚动，期间后台线程解析上一份快照
+            for _ in range(scrolls_per_burst):
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                row_count = readiness.wait_for_growth(row_count)
+                if readiness.reached_end:
+                    break
+            print(f"📊 第{attempt + 1}轮滚动完成，页面 {row_count} 行")
+
+            if readiness.reached_end:
+                print("🛑 行数和页面高度多次不再变化，已到列表末尾")
+                html_queue.put(driver.page_source)
+                break
+        else:
+            html_queue.put(driver.page_source)  # 最后一轮滚动的结果
+
+    except Exception as e:
+        print(f"❌ 采集过程出错: {e}")
+        import traceback
+        print(f"📋 详细错误: {traceback.format_exc()}")
+
+    finally:
+        html_queue.put(None)
+        worker.join()
+        print("🔚 关闭浏览器...")
+        try:
+            driver.quit()
+        except:
+            pass
+
+    print(f"✅ 采集完成！共获取 {len(tools_data)} 条数据")
+    return tools_data[:target_count]
+
+def collect_shard(shard_url, target_count, max_scroll_attempts):
+    """分片工作进程：在独立的浏览器里采集一个榜单"""
+    print(f"🧩 分片开始: {shard_url}")
+    tools_data = collect_toolify_data(
+        target_count=target_count,
+        max_scroll_attempts=max_scroll_attempts,
+        url=shard_url
+    )
+    print(f"🧩 分片完成: {shard_url} -> {len(tools_data)} 条")
+    return tools_data
+
+def merge_shard_results(shard_results):
+    """按 tool_name 去重合并分片结果
+
+    第一个分片保留原排名，后续分片的新工具依次排在已合并的最大排名之后
+    （第一个分片有缺号或去掉了重复行时，按条数续排会与它的真实排名冲突）
+    """
+    merged = []
+    seen_tools = set()
+    max_ranking = 0
+
+    for shard_index, tools_data in enumerate(shard_results):
+        for tool in tools_data:
+            if tool["tool_name"] in seen_tools:
+                continue
+            seen_tools.add(tool["tool_name"])
+            if shard_index > 0:
+                tool = dict(tool, ranking=max_ranking + 1)
+                tool["content_hash"] = content_hash(tool)  # 排名参与哈希
+            max_ranking = max(max_ranking, tool["ranking"])
+            merged.append(tool)
+
+    return merged
+
+def collect_toolify_data_sharded(target_count=300, max_scroll_attempts=10, shard_urls=None, workers=None):
+    """采集Toolify数据 - 多进程分片模式，每个进程一个浏览器、一个榜单"""
+    shard_urls = shard_urls or DEFAULT_SHARD_URLS
+    workers = workers or min(len(shard_urls), os.cpu_count() or 1)
+    print(f"🚀 开始分片采集: {len(shard_urls)} 个榜单，{workers} 个工作进程，每个榜单目标 {target_count} 条")
+
+    shard_results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(collect_shard, shard_url, target_count, max_scroll_attempts)
+            for shard_url in shard_urls
+        ]
+        # 按分片顺序收集，保证主榜单排在前面
+        for shard_url, future in zip(shard_urls, futures):
+            try:
+                shard_results.append(future.result())
+            except Exception as e:
+                print(f"❌ 分片失败 {shard_url}: {e}")
+                shard_results.append([])
+
+    tools_data = merge_shard_results(shard_results)
+    print(f"✅ 分片采集完成！合并去重后共 {len(tools_data)} 条数据")
+    return tools_data
+
+def fetch_ranking_page(session, page_url, page, per_page, max_retries=3):
+    """获取一页排行榜 JSON，返回工具记录列表；请求失败时返回 None（与空页区分开）"""
+    url = page_url.format(page=page, per_page=per_page)
+
+    for retry_count in range(1, max_retries + 1):
+        try:
+            response = session.get(url, timeout=30)
+            if response.status_code == 200:
+                return find_tool_records(response.json())
+            if response.status_code not in [429, 502, 503, 504]:
+                print(f"❌ 第{page}页请求失败: {response.status_code} - {response.text[:200]}")
+                return None
+            print(f"⚠️ 第{page}页服务器繁忙 {response.status_code}，重试 ({retry_count}/{max_retries})")
+        except Exception as e:
+            print(f"⚠️ 第{page}页请求异常，重试 ({retry_count}/{max_retries}): {e}")
+        time.sleep(retry_count * 2)
+
+    print(f"❌ 第{page}页重试失败")
+    return None
+
+def collect_toolify_data_http(target_count=300, concurrency=8, per_page=100, on_rows=None):
+    """采集Toolify数据 - 直连分页接口，不启动浏览器
+
+    接口地址由 TOOLIFY_PAGE_URL 提供，包含 {page} 和 {per_page} 占位符，
+    可从 network 模式（NETWORK_CAPTURE_PATTERN=toolify.ai）打印的响应地址中获得
+    on_rows 每波请求完成后按排名顺序收到本波新增的 tool_data 列表（用于流式上传）
+    """
+    page_url = os.getenv('TOOLIFY_PAGE_URL', '').strip()
+    if not page_url:
+        print("⚠️ 未配置 TOOLIFY_PAGE_URL，无法使用直连接口模式")
+        return []
+
+    print(f"🚀 开始直连接口采集，目标 {target_count} 条，并发 {concurrency}，每页 {per_page} 条...")
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "Accept": "application/json",
+        "Accept-Language": "zh-CN,zh;q=0.9"
+    })
+
+    collection_batch = f"github-actions-{datetime.now().strftime('%Y-%m-%d')}"
+    total_pages = (target_count + per_page - 1) // per_page
+    tools_data = []
+    seen_tools = set()
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # 按并发数分波请求，某一页不满说明已到末尾，不再请求后续页
+            for wave_start in range(1, total_pages + 1, concurrency):
+                pages = range(wave_start, min(wave_start + concurrency, total_pages + 1))
+                results = list(executor.map(
+                    lambda page: fetch_ranking_page(session, page_url, page, per_page), pages
+                ))
+
+                failed_pages = [page for page, records in zip(pages, results) if records is None]
+                if failed_pages:
+                    # 缺页会让后面的排名整体错位，宁可整体放弃、由调用方回退到 DOM 采集
+                    print(f"❌ 第 {', '.join(map(str, failed_pages))} 页获取失败，放弃直连接口结果")
+                    return []
+
+                reached_end = False
+                initial_count = len(tools_data)
+                for page, records in zip(pages, results):
+                    print(f"📄 第{page}页: {len(records)} 条记录")
+                    for offset, record in enumerate(records):
+                        raw_row = record_to_raw_row(record)
+                        if raw_row["tool_name"] in seen_tools:
+                            continue
+                        seen_tools.add(raw_row["tool_name"])
+                        ranking = parse_ranking(raw_row["ranking"], (page - 1) * per_page + offset + 1)
+                        tools_data.append(build_tool_data(raw_row, ranking, collection_batch))
+                    if len(records) < per_page:
+                        reached_end = True
+
+                print(f"📊 已获取 {len(tools_data)} 条数据...")
+                if on_rows and len(tools_data) > initial_count:
+                    # 只交出目标数量以内的行，与最终返回的结果一致
+                    new_rows = sorted(tools_data[initial_count:], key=lambda tool: tool["ranking"])
+                    on_rows(new_rows[:max(target_count - initial_count, 0)])
+                if reached_end or len(tools_data) >= target_count:
+                    break
+    finally:
+        session.close()
+
+    tools_data.sort(key=lambda tool: tool["ranking"])
+    print(f"✅ 直连接口采集完成！共获取 {len(tools_data)} 条数据")
+    return tools_data[:target_count]
+
+_supabase_client = None
+
+def get_supabase_client():
+    """进程内共用的 Supabase REST 客户端（连接池复用），配置缺失时返回 None"""
+    global _supabase_client
+    if _supabase_client is None:
+        _supabase_client = client_from_env()
+    return _supabase_client
+
+def check_supabase_connection(client):
+    """测试数据库连接"""
     try:
         print("🔍 测试数据库连接...")
-        test_response = requests.get(f'{url}/rest/v1/toolify_tools?limit=1', headers=headers, timeout=10)
+        test_response = client.get('toolify_tools?limit=1', timeout=10)
 
         if test_response.status_code != 200:
             print(f"❌ 数据库连接失败: {test_response.text}")
             return False
         else:
             print("✅ 数据库连接正常")
+            return True
     except Exception as e:
         print(f"❌ 数据库连接异常: {e}")
         return False
 
-    # 分批上传，提高效率
-    batch_size = 100  # 每批100条数据
-    print(f"🚀 开始分批上传 {len(tools_data)} 条数据（每批{batch_size}条）...")
-    success_count = 0
-    total_batches = (len(tools_data) + batch_size - 1) // batch_size
-
-    for batch_num in range(total_batches):
-        start_idx = batch_num * batch_size
-        end_idx = min(start_idx + batch_size, len(tools_data))
-        batch_data = tools_data[start_idx:end_idx]
-
-        print(f"📦 上传第 {batch_num + 1}/{total_batches} 批数据 (第{start_idx + 1}-{end_idx}条)...")
+# 需要执行迁移脚本才有的列；未执行时写入会整批报 PGRST204，所以上传前探测一次，缺失的列不发送
+OPTIONAL_COLUMNS = {
+    "content_hash": "add-content-hash.sql",
+    "monthly_visits_num": "add-numeric-metrics.sql",
+    "growth_num": "add-numeric-metrics.sql",
+    "growth_rate_num": "add-numeric-metrics.sql"
+}
+
+def find_missing_columns(client):
+    """返回 toolify_tools 中不存在的可选列（查询不存在的列时 PostgREST 返回 400）"""
+    missing = set()
+    for column, script in OPTIONAL_COLUMNS.items():
+        try:
+            response = client.get('toolify_tools', params={'select': column, 'limit': 0}, timeout=10)
+        except Exception as e:
+            print(f"⚠️ 探测 {column} 列失败: {e}")
+            continue
+        if response.status_code == 400:
+            missing.add(column)
+            print(f"⚠️ toolify_tools 没有 {column} 列（是否已执行 {script}？），上传时不写入该列")
+    return missing
+
+def strip_columns(tools_data, columns):
+    """去掉库中不存在的列"""
+    if not columns:
+        return tools_data
+    return [{k: v for k, v in tool.items() if k not in columns} for tool in tools_data]
+
+class UploadThrottle:
+    """并发上传共用的退避闸门：任一批次收到过载信号，所有上传线程一起暂停"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.resume_at = 0.0
+
+    def wait(self):
+        """发请求前调用，处于退避期则等待"""
+        delay = self.resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def backoff(self, seconds):
+        """进入退避期，已有更长的退避则保持"""
+        with self.lock:
+            self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+
+class AdaptiveBatchSizer:
+    """AIMD 批大小控制：从配置的 batch_size 起步，请求健康就线性增大，超时/5xx 就减半
+
+    延迟超过 target_latency 时轻度收缩；400 等数据错误与批大小无关，不反馈
+    """
+
+    def __init__(self, initial=100, min_size=10, max_size=1000, step=None, target_latency=None):
+        self.lock = threading.Lock()
+        self.initial = max(min_size, initial)
+        self.min_size = min_size
+        self.max_size = max(max_size, self.initial)
+        self.size = self.initial
+        self.step = step or max(10, self.initial // 4)
+        if target_latency is None:
+            target_latency = float(os.getenv('UPLOAD_TARGET_LATENCY') or '5')
+        self.target_latency = target_latency
+        self.history = []  # 每次调整后的批大小
+
+    def record(self, outcome, latency=0.0):
+        """记录一次请求结果：outcome 为 'ok'（附带耗时）或 'overload'（超时/5xx/429/413）"""
+        with self.lock:
+            if outcome == 'overload':
+                self.size = max(self.min_size, self.size // 2)
+            elif outcome == 'ok' and latency > self.target_latency:
+                self.size = max(self.min_size, int(self.size * 0.8))
+            else:
+                self.size = min(self.max_size, self.size + self.step)
+            self.history.append(self.size)
+
+    def converged_size(self):
+        """最近 8 次调整的中位数"""
+        recent = sorted(self.history[-8:]) or [self.size]
+        return recent[len(recent) // 2]
+
+    def report(self):
+        if not self.history:
+            return
+        print(f"📐 批大小收敛于 {self.converged_size()} 条（起始 {self.initial}，"
+              f"范围 {min(self.history)}-{max(self.history)}，共调整 {len(self.history)} 次）")
+
+class RpcTotals:
+    """upsert_toolify_tools 返回的新增/更新/未变化条数累计，上传线程共用"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+
+    def add(self, result):
+        with self.lock:
+            for key in self.counts:
+                self.counts[key] += result.get(key, 0)
+
+    def report(self):
+        print(f"🧮 RPC upsert: 新增 {self.counts['inserted']} 条，更新 {self.counts['updated']} 条，"
+              f"未变化 {self.counts['unchanged']} 条")
+
+def backoff_wait(throttle, wait_time):
+    """重试前退避：并发模式下通过闸门让所有线程一起等待"""
+    if throttle:
+        throttle.backoff(wait_time)
+    else:
+        time.sleep(wait_time)
 
-        if batch_num == 0:
-            print(f"🔍 首批数据示例: {batch_data[0]}")  # 显示第一批的第一条数据
+def is_row_error(response):
+    """4xx 是否由行数据引起（超长、违反约束等 Postgres 错误），而不是整个请求的问题
 
-        max_retries = 3
-        retry_count = 0
+    PGRST 开头的是 PostgREST 自身的错误（列不存在、请求体无法解析等），拆分批次也无济于事
+    """
+    if response.status_code not in [400, 409, 413, 422]:
+        return False
+    try:
+        code = response.json().get('code') or ''
+    except ValueError:
+        return response.status_code == 413
+    return not str(code).startswith('PGRST')
+
+def bisect_batch(client, batch_data, batch_label, response, dead_letter, max_retries=3, throttle=None, rpc_totals=None):
+    """二分定位被拒绝批次中的坏行：坏行写入死信文件，其余行照常上传，返回成功上传的工具名
+
+    k 个坏行只多出约 2k·log2(批大小) 次请求；某一半重试耗尽（5xx、超时）时不计入成功，也不进死信
+    """
+    if len(batch_data) == 1:
+        dead_letter.write(batch_data[0], response.status_code, response.text)
+        print(f"☠️ {batch_label}被拒绝: {str(batch_data[0].get('tool_name'))[:80]} - {response.status_code} {response.text[:200]}")
+        return []
 
-        while retry_count < max_retries:
-            try:
-                # 使用Prefer: resolution=merge-duplicates进行upsert批量插入
-                batch_headers = headers.copy()
-                batch_headers['Prefer'] = 'resolution=merge-duplicates'
-
-                response = requests.post(
-                    f'{url}/rest/v1/toolify_tools',
-                    headers=batch_headers,
-                    json=batch_data,
+    mid = len(batch_data) // 2
+    print(f"🔪 {batch_label}被拒绝（{response.status_code}），拆成 {mid}+{len(batch_data) - mid} 条重试")
+    uploaded = []
+    for i, half in enumerate((batch_data[:mid], batch_data[mid:])):
+        uploaded.extend(upload_batch(client, half, f"{batch_label}-{i + 1}", max_retries=max_retries,
+                                     throttle=throttle, dead_letter=dead_letter, rpc_totals=rpc_totals))
+    return uploaded
+
+def upload_batch(client, batch_data, batch_label, max_retries=3, throttle=None, sizer=None, dead_letter=None,
+                 rpc_totals=None):
+    """上传一批数据（upsert），429/502/503/504、超时和网络异常时退避重试，返回成功上传的工具名列表
+
+    传入 sizer 时把每次请求的状态和耗时反馈给批大小控制器
+    传入 dead_letter 时，因行数据被拒绝的批次会二分重试，坏行写入死信文件
+    传入 rpc_totals 时改为调用 upsert_toolify_tools 函数，返回的各项条数累计到 rpc_totals
+    """
+    retry_count = 0
+
+    def feedback(outcome, latency=0.0):
+        if sizer:
+            sizer.record(outcome, latency)
+
+    while retry_count < max_retries:
+        if throttle:
+            throttle.wait()
+        try:
+            # 使用Prefer: resolution=merge-duplicates进行upsert批量插入，按唯一的 tool_name 判断冲突
+            start = time.monotonic()
+            if rpc_totals is not None:
+                # 服务端一次集合操作完成 upsert（scripts/upsert-tools-function.sql）
+                response = client.post_json('rpc/upsert_toolify_tools', {'tools': batch_data}, timeout=60)
+            else:
+                response = client.post_json(
+                    'toolify_tools?on_conflict=tool_name',
+                    batch_data,
+                    headers={'Prefer': 'resolution=merge-duplicates'},
                     timeout=60  # 批量上传需要更长超时时间
                 )
-
-                if response.status_code in [200, 201]:
-                    batch_success = len(batch_data)
-                    success_count += batch_success
-                    print(f"✅ 第 {batch_num + 1} 批上传成功 ({batch_success}条)，累计: {success_count}/{len(tools_data)}")
-                    break  # 成功，退出重试循环
-
-                elif response.status_code in [502, 503, 504]:
-                    # 服务器错误，等待后重试
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        wait_time = retry_count * 3  # 批量上传使用更长的退避时间
-                        print(f"⚠️ 服务器错误 {response.status_code}，{wait_time}秒后重试第{batch_num + 1}批 ({retry_count}/{max_retries})")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        print(f"❌ 第 {batch_num + 1} 批重试失败: {response.status_code} - {response.text[:200]}")
-                        break
-
-                else:
-                    print(f"❌ 第 {batch_num + 1} 批上传失败: {response.status_code} - {response.text[:200]}")
-                    break
-
-            except requests.exceptions.Timeout:
+            latency = time.monotonic() - start
+
+            if response.status_code in [200, 201]:
+                feedback('ok', latency)
+                if rpc_totals is not None:
+                    rpc_totals.add(response.json())
+                return [tool["tool_name"] for tool in batch_data]
+
+            if response.status_code in [413, 429] or response.status_code >= 500:
+                feedback('overload')  # 过载或请求体过大：缩小批次
+            if response.status_code in [429, 502, 503, 504]:
+                # 服务器过载，等待后重试
                 retry_count += 1
                 if retry_count < max_retries:
-                    wait_time = retry_count * 3
-                    print(f"⚠️ 第 {batch_num + 1} 批请求超时，{wait_time}秒后重试 ({retry_count}/{max_retries})")
-                    time.sleep(wait_time)
+                    wait_time = retry_count * 3  # 批量上传使用更长的退避时间
+                    print(f"⚠️ 服务器错误 {response.status_code}，{wait_time}秒后重试{batch_label} ({retry_count}/{max_retries})")
+                    backoff_wait(throttle, wait_time)
                     continue
                 else:
-                    print(f"❌ 第 {batch_num + 1} 批超时失败")
-                    break
+                    print(f"❌ {batch_label}重试失败: {response.status_code} - {response.text[:200]}")
+                    return []
+
+            elif dead_letter is not None and is_row_error(response):
+                return bisect_batch(client, batch_data, batch_label, response, dead_letter,
+                                    max_retries=max_retries, throttle=throttle, rpc_totals=rpc_totals)
+
+            else:
+                print(f"❌ {batch_label}上传失败: {response.status_code} - {response.text[:200]}")
+                return []
+
+        except requests.exceptions.Timeout:
+            feedback('overload')
+            retry_count += 1
+            if retry_count < max_retries:
+                wait_time = retry_count * 3
+                print(f"⚠️ {batch_label}请求超时，{wait_time}秒后重试 ({retry_count}/{max_retries})")
+                backoff_wait(throttle, wait_time)
+                continue
+            else:
+                print(f"❌ {batch_label}超时失败")
+                return []
 
-            except Exception as e:
-                retry_count += 1
-                if retry_count < max_retries:
-                    wait_time = retry_count * 3
-                    print(f"⚠️ 第 {batch_num + 1} 批网络异常，{wait_time}秒后重试 ({retry_count}/{max_retries}): {e}")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"❌ 第 {batch_num + 1} 批处理异常: {e}")
-                    break
+        except Exception as e:
+            retry_count += 1
+            if retry_count < max_retries:
+                wait_time = retry_count * 3
+                print(f"⚠️ {batch_label}网络异常，{wait_time}秒后重试 ({retry_count}/{max_retries}): {e}")
+                backoff_wait(throttle, wait_time)
+                continue
+            else:
+                print(f"❌ {batch_label}处理异常: {e}")
+                return []
+
+    return []
+
+def upload_batches_concurrently(client, tools_data, concurrency, sizer, dead_letter=None, rpc_totals=None):
+    """有界线程池并发上传，每批在提交时按 sizer 当前的批大小切分，返回成功总条数"""
+    throttle = UploadThrottle()
+    success_count = 0
+    offset = 0
+    batch_num = 0
+    pending = {}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while offset < len(tools_data) or pending:
+            while offset < len(tools_data) and len(pending) < concurrency:
+                batch_data = tools_data[offset:offset + sizer.size]
+                offset += len(batch_data)
+                batch_num += 1
+                future = executor.submit(upload_batch, client, batch_data, f"第 {batch_num} 批",
+                                         throttle=throttle, sizer=sizer, dead_letter=dead_letter,
+                                         rpc_totals=rpc_totals)
+                pending[future] = batch_num
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                done_num = pending.pop(future)
+                batch_success = len(future.result())
+                if batch_success:
+                    success_count += batch_success
+                    print(f"✅ 第 {done_num} 批上传成功 ({batch_success}条)，累计: {success_count}/{len(tools_data)}")
+
+    return success_count
+
+def get_dead_letter_path():
+    """死信文件路径，默认按日期命名，可用 DEAD_LETTER_FILE 覆盖"""
+    return os.getenv('DEAD_LETTER_FILE') or f"./toolify-dead-letter-{datetime.now().strftime('%Y-%m-%d')}.ndjson"
+
+def get_upload_mode():
+    """UPLOAD_MODE: upsert（默认，PostgREST merge-duplicates）或 rpc（upsert_toolify_tools 函数）"""
+    mode = (os.getenv('UPLOAD_MODE') or 'upsert').strip().lower()
+    if mode not in ('upsert', 'rpc'):
+        print(f"⚠️ 未知的 UPLOAD_MODE: {mode}，使用 upsert")
+        mode = 'upsert'
+    return mode
+
+def upload_to_supabase(tools_data, concurrency=None, batch_size=None, delta=None, mode=None, snapshots=None):
+    """上传数据到Supabase - 简化版
+
+    concurrency > 1 时用有界线程池并发上传，未指定时读取 UPLOAD_CONCURRENCY（默认1，逐批上传）
+    batch_size 是自适应批大小的起点，未指定时读取 system_settings 的 batch_size
+    delta=True 时只上传内容哈希有变化的行，未指定时读取 UPLOAD_DELTA
+    mode='rpc' 时调用服务端批量 upsert 函数，未指定时读取 UPLOAD_MODE
+    snapshots=True 时另把全部行追加到历史快照表，未指定时读取 SNAPSHOTS（默认写入）
+    """
+    if not tools_data:
+        print("❌ 没有数据需要上传")
+        return False
+
+    client = get_supabase_client()
+
+    if not client:
+        print("❌ Supabase配置缺失")
+        return False
+
+    print(f"📤 准备上传 {len(tools_data)} 条数据...")
+
+    # 验证数据格式
+    print("🔍 验证数据格式...")
+    for i, tool in enumerate(tools_data[:3]):  # 检查前3条
+        required_fields = ['tool_name', 'tool_url', 'ranking']
+        missing_fields = [field for field in required_fields if not tool.get(field)]
+        if missing_fields:
+            print(f"⚠️ 第{i+1}条数据缺少字段: {missing_fields}")
+        else:
+            print(f"✅ 第{i+1}条数据格式正确: {tool['tool_name']}")
 
+    # 测试连接
+    if not check_supabase_connection(client):
+        return False
+
+    if snapshots is None:
+        snapshots = snapshots_enabled()
+    if snapshots:
+        # 快照记录本次采集的全部行，包括增量上传会跳过的未变化行
+        snapshot_writer = SnapshotWriter(client)
+        snapshot_writer.write(tools_data)
+        snapshot_writer.report()
+
+    if delta is None:
+        delta = os.getenv('UPLOAD_DELTA', '').strip().lower() in ('1', 'true', 'yes')
+    if delta:
+        existing_hashes = fetch_existing_hashes(client)
+        if existing_hashes is None:
+            print("⚠️ 增量上传不可用（是否已执行 add-content-hash.sql？），改为全量上传")
+        else:
+            tools_data, unchanged = split_changed(tools_data, existing_hashes)
+            print(f"🔍 增量上传: {len(tools_data)} 条新增或有变化，{len(unchanged)} 条未变化跳过")
+            if not tools_data:
+                return True
+
+    tools_data = strip_columns(tools_data, find_missing_columns(client))
+
+    # 分批上传，批大小从配置值起步自适应调整；被拒绝的行写入死信文件
+    dead_letter = DeadLetterFile(get_dead_letter_path())
+    rpc_totals = RpcTotals() if (mode or get_upload_mode()) == 'rpc' else None
+    if batch_size is None:
+        batch_size = get_settings_from_db()['batch_size']
+    sizer = AdaptiveBatchSizer(batch_size)
+    if concurrency is None:
+        concurrency = int(os.getenv('UPLOAD_CONCURRENCY') or '1')
+
+    if concurrency > 1:
+        print(f"🚀 开始并发上传 {len(tools_data)} 条数据（起始每批{batch_size}条，并发{concurrency}）...")
+        success_count = upload_batches_concurrently(client, tools_data, concurrency, sizer, dead_letter, rpc_totals)
+        sizer.report()
+        if rpc_totals:
+            rpc_totals.report()
+        dead_letter.close()
+        print(f"📦 累计请求体: {client.payload_stats.summary()}")
+        print(f"📊 上传完成: {success_count}/{len(tools_data)} 成功")
+        return success_count > 0
+
+    print(f"🚀 开始分批上传 {len(tools_data)} 条数据（起始每批{batch_size}条）...")
+    success_count = 0
+    start_idx = 0
+    batch_num = 0
+
+    while start_idx < len(tools_data):
+        end_idx = min(start_idx + sizer.size, len(tools_data))
+        batch_data = tools_data[start_idx:end_idx]
+        batch_num += 1
+
+        print(f"📦 上传第 {batch_num} 批数据 (第{start_idx + 1}-{end_idx}条，共{len(tools_data)}条)...")
+
+        if batch_num == 1:
+            print(f"🔍 首批数据示例: {batch_data[0]}")  # 显示第一批的第一条数据
+
+        batch_success = len(upload_batch(client, batch_data, f"第 {batch_num} 批", sizer=sizer,
+                                         dead_letter=dead_letter, rpc_totals=rpc_totals))
+        if batch_success:
+            success_count += batch_success
+            print(f"✅ 第 {batch_num} 批上传成功 ({batch_success}条)，累计: {success_count}/{len(tools_data)}")
+
+        start_idx = end_idx
         # 每批之间暂停，避免请求过快
-        if batch_num < total_batches - 1:  # 不是最后一批
+        if start_idx < len(tools_data):  # 不是最后一批
             time.sleep(0.5)
 
+    sizer.report()
+    if rpc_totals:
+        rpc_totals.report()
+    dead_letter.close()
+    print(f"📦 累计请求体: {client.payload_stats.summary()}")
     print(f"📊 上传完成: {success_count}/{len(tools_data)} 成功")
     return success_count > 0
 
+SNAPSHOT_FIELDS = [
+    "tool_name", "collection_batch", "collected_at", "ranking", "tool_url", "monthly_visits", "growth",
+    "growth_rate", "monthly_visits_num", "growth_num", "growth_rate_num", "description", "tags"
+]
+
+class SnapshotWriter:
+    """历史快照：把每次采集的行追加到按月分区的 toolify_tool_snapshots（scripts/snapshots-table.sql）
+
+    每行带上批次日期 batch_date（分区键，从批次号解析，解析不出时取本次运行的日期），
+    主键 (collection_batch, tool_name, batch_date) 让同一批次重跑时已有的行被忽略
+    写入前确保数据涉及的月份分区存在；表不存在时提示一次后停用
+    """
+
+    def __init__(self, client, chunk_size=1000, max_retries=3):
+        self.client = client
+        self.run_date = datetime.now().date().isoformat()
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.lock = threading.Lock()
+        self.months = set()  # 已确保分区存在的月份
+        self.enabled = True
+        self.success_count = 0
+
+    def write(self, rows):
+        for start in range(0, len(rows), self.chunk_size):
+            if not self.enabled:
+                return
+            self._insert([self._snapshot_row(tool) for tool in rows[start:start + self.chunk_size]])
+
+    def _snapshot_row(self, tool):
+        row = {field: tool.get(field) for field in SNAPSHOT_FIELDS}
+        row["collected_at"] = row["collected_at"] or datetime.now().isoformat()
+        row["collection_batch"] = row["collection_batch"] or ""
+        row["batch_date"] = batch_date(row["collection_batch"]) or self.run_date
+        return row
+
+    def _ensure_partitions(self, rows):
+        """确保 rows 涉及的月份分区存在；分区函数不存在或请求异常时返回 False（停用快照）"""
+        with self.lock:
+            months = {row["batch_date"][:7] for row in rows} - self.months
+        for month in sorted(months):
+            try:
+                response = self.client.post_json('rpc/create_toolify_snapshot_partition',
+                                                 {'p_month': f'{month}-01'}, timeout=30)
+            except requests.exceptions.RequestException as e:
+                self._disable(f"创建快照分区 {month} 请求异常: {e}")
+                return False
+            if response.status_code == 404:
+                return False
+            if response.status_code != 200:
+                print(f"⚠️ 创建快照分区 {month} 失败: {response.status_code} - {response.text[:200]}")
+                continue
+            with self.lock:
+                self.months.add(month)
+        return True
+
+    def _insert(self, rows):
+        if not self._ensure_partitions(rows):
+            self._disable()
+            return
+
+        error = None
+        for retry_count in range(1, self.max_retries + 1):
+            try:
+                response = self.client.post_json(
+                    'toolify_tool_snapshots?on_conflict=collection_batch,tool_name,batch_date',
+                    rows,
+                    headers={'Prefer': 'resolution=ignore-duplicates'},
+                    timeout=60
+                )
+            except requests.exceptions.RequestException as e:
+                error = str(e)
+            else:
+                if response.status_code in [200, 201]:
+                    with self.lock:
+                        self.success_count += len(rows)
+                    return
+                if response.status_code == 404:
+                    self._disable()
+                    return
+                error = f"{response.status_code} - {response.text[:200]}"
+                if response.status_code not in [429, 502, 503, 504]:
+                    break
+            if retry_count < self.max_retries:
+                time.sleep(retry_count * 3)
+
+        print(f"⚠️ {len(rows)} 条快照写入失败: {error}")
+
+    def _disable(self, reason=None):
+        if self.enabled:
+            self.enabled = False
+            reason = reason or "未找到 toolify_tool_snapshots 表或分区函数（是否已执行 snapshots-table.sql？）"
+            print(f"⚠️ {reason}，跳过历史快照")
+
+    def report(self):
+        if self.success_count:
+            print(f"🗂️ 历史快照已提交 {self.success_count} 条（重传的行由数据库忽略）")
+
+def snapshots_enabled():
+    """SNAPSHOTS=false 时不写历史快照（默认写入）"""
+    return os.getenv('SNAPSHOTS', 'true').strip().lower() not in ('0', 'false', 'no')
+
+class StreamingUploader:
+    """边采集边上传：攒满一批就交给后台上传线程，同时增量写本地备份
+
+    采集线程调用 add()，上传线程消费有界队列，总耗时约为 max(采集, 上传)
+    backup 是 BackupWriter，每批数据压缩写入后立即刷盘
+    """
+
+    def __init__(self, backup, batch_size=100, queue_size=4, journal=None, concurrency=1, delta=False,
+                 mode='upsert', snapshots=True):
+        self.backup = backup
+        self.write_snapshots = snapshots
+        self.snapshots = None  # SnapshotWriter，数据库可用时创建
+        self.snapshot_buffer = []
+        self.rpc_totals = RpcTotals() if mode == 'rpc' else None  # rpc 模式调用服务端批量 upsert 函数
+        self.delta = delta  # 只上传内容哈希有变化的行
+        self.existing_hashes = None  # 库中已有的 {tool_name: content_hash}，增量上传可用时才有值
+        self.missing_columns = set()  # 库中还没有的可选列，上传前去掉
+        self.skipped_count = 0
+        self.dead_letter = DeadLetterFile(get_dead_letter_path())
+        self.concurrency = concurrency  # 上传线程数，>1 时共用退避闸门
+        self.throttle = UploadThrottle() if concurrency > 1 else None
+        self.lock = threading.Lock()
+        self.journal = journal  # 断点日志，记录已采集的行和已上传的批次
+        self.persisted_names = set()  # 已写入日志的工具名，续采时跳过
+        self.sizer = AdaptiveBatchSizer(batch_size)  # 每次切批时取当前批大小
+        self.batches = queue.Queue(maxsize=queue_size)  # 上传跟不上时让采集等待
+        self.buffer = []
+        self.total_rows = 0
+        self.success_count = 0
+        self.batch_num = 0
+        self.client = None
+        self.threads = []
+
+    def start(self):
+        """检查数据库连接，启动上传线程"""
+        self.client = get_supabase_client()
+        if not self.client:
+            print("❌ Supabase配置缺失，仅保存本地备份")
+        elif not check_supabase_connection(self.client):
+            self.client = None
+
+        if self.client:
+            self.missing_columns = find_missing_columns(self.client)
+
+        if self.client and self.delta:
+            self.existing_hashes = fetch_existing_hashes(self.client)
+            if self.existing_hashes is None:
+                print("⚠️ 增量上传不可用（是否已执行 add-content-hash.sql？），改为全量上传")
+            else:
+                print(f"🔍 增量上传: 库中已有 {len(self.existing_hashes)} 条内容哈希")
+
+        if self.client and self.write_snapshots:
+            self.snapshots = SnapshotWriter(self.client)
+
+        if self.client:
+            self.threads = [
+                threading.Thread(target=self._upload_worker, daemon=True)
+                for _ in range(self.concurrency)
+            ]
+            for thread in self.threads:
+                thread.start()
+            print(f"🚀 流式上传已启动（起始每批{self.sizer.size}条，{self.concurrency}个上传线程）")
+
+    def resume(self, rows, uploaded_names):
+        """续采：把日志中已采集的行写回备份，未上传的重新排队"""
+        self.persisted_names.update(tool["tool_name"] for tool in rows)
+        missing = [tool for tool in rows if tool["tool_name"] not in uploaded_names]
+        print(f"♻️ 从断点日志恢复 {len(rows)} 条，其中 {len(missing)} 条待上传")
+
+        self._write_backup(rows)
+        self.success_count += len(rows) - len(missing)
+        self._enqueue_snapshots(rows)  # 快照按主键去重，已写过的会被忽略
+        self._enqueue(missing)
+
+    def add(self, rows):
+        """接收新采集的行：写入断点日志和备份，攒满一批就放入上传队列"""
+        rows = [tool for tool in rows if tool["tool_name"] not in self.persisted_names]
+        if not rows:
+            return
+
+        self.persisted_names.update(tool["tool_name"] for tool in rows)
+        if self.journal:
+            self.journal.append_rows(rows)
+        self._write_backup(rows)
+        self._enqueue_snapshots(rows)
+        self._enqueue(rows)
+
+    def _write_backup(self, rows):
+        self.backup.write(rows)
+        self.backup.flush()
+        self.total_rows += len(rows)
+
+    def _enqueue(self, rows):
+        if self.threads:
+            if self.existing_hashes is not None:
+                rows, unchanged = split_changed(rows, self.existing_hashes)
+                self._skip_unchanged(unchanged)
+            self.buffer.extend(strip_columns(rows, self.missing_columns))
+            while len(self.buffer) >= self.sizer.size:
+                batch_size = self.sizer.size
+                self.batches.put(self.buffer[:batch_size])
+                self.buffer = self.buffer[batch_size:]
+
+    def _enqueue_snapshots(self, rows):
+        """快照攒满一块就以 ("snapshot", rows) 放入上传队列，由上传线程写入"""
+        if self.threads and self.snapshots:
+            self.snapshot_buffer.extend(rows)
+            while len(self.snapshot_buffer) >= self.snapshots.chunk_size:
+                self.batches.put(("snapshot", self.snapshot_buffer[:self.snapshots.chunk_size]))
+                self.snapshot_buffer = self.snapshot_buffer[self.snapshots.chunk_size:]
+
+    def _skip_unchanged(self, rows):
+        """未变化的行视为已上传"""
+        if not rows:
+            return
+        if self.journal:
+            self.journal.mark_uploaded(tool["tool_name"] for tool in rows)
+        with self.lock:
+            self.skipped_count += len(rows)
+            self.success_count += len(rows)
+
+    def _upload_worker(self):
+        # 任何异常都不能让线程退出：队列没有消费者时采集线程会永远阻塞在 add()
+        while True:
+            batch_data = self.batches.get()
+            if batch_data is None:
+                break
+            try:
+                self._process_batch(batch_data)
+            except Exception as e:
+                print(f"❌ 上传线程处理批次出错: {e}")
+
+    def _process_batch(self, batch_data):
+        """处理队列中的一项：历史快照或一批待上传的行"""
+        if isinstance(batch_data, tuple):
+            self.snapshots.write(batch_data[1])
+            return
+        with self.lock:
+            self.batch_num += 1
+            batch_num = self.batch_num
+        uploaded = upload_batch(self.client, batch_data, f"第 {batch_num} 批",
+                                throttle=self.throttle, sizer=self.sizer, dead_letter=self.dead_letter,
+                                rpc_totals=self.rpc_totals)
+        # 只记录真正写入成功的行；重试耗尽的行留给 --resume 补传
+        if uploaded and self.journal:
+            self.journal.mark_uploaded(uploaded)
+        batch_success = len(uploaded)
+        if batch_success:
+            with self.lock:
+                self.success_count += batch_success
+                success_count = self.success_count
+            print(f"✅ 第 {batch_num} 批上传成功 ({batch_success}条)，累计: {success_count}/{self.total_rows}")
+
+    def close(self):
+        """上传剩余数据，等待上传线程结束，关闭备份；返回成功上传的条数"""
+        if self.threads:
+            if self.buffer:
+                self.batches.put(self.buffer)
+                self.buffer = []
+            if self.snapshot_buffer:
+                self.batches.put(("snapshot", self.snapshot_buffer))
+                self.snapshot_buffer = []
+            for _ in self.threads:
+                self.batches.put(None)
+            for thread in self.threads:
+                thread.join()
+            self.sizer.report()
+            if self.rpc_totals:
+                self.rpc_totals.report()
+            if self.snapshots:
+                self.snapshots.report()
+            self.dead_letter.close()
+            print(f"📦 累计请求体: {self.client.payload_stats.summary()}")
+
+        self.backup.close()
+
+        if self.journal:
+            self.journal.close()
+
+        if self.skipped_count:
+            print(f"⏭️ 增量上传跳过 {self.skipped_count} 条未变化的数据")
+        print(f"📊 上传完成: {self.success_count}/{self.total_rows} 成功")
+        return self.success_count
+
 def main():
     """主函数"""
     print("🔥 main函数开始执行")
@@ -459,26 +1640,98 @@ def main():
     print(f"🎯 最终采集目标: {target_count} 条")
     print(f"🔄 最大滚动次数: {max_scroll_attempts}")
 
-    # 采集数据
-    tools_data = collect_toolify_data(
-        target_count=target_count,
-        max_scroll_attempts=max_scroll_attempts
+    # 采集模式: dom（默认，解析页面表格）| network（抓取滚动加载的 JSON 响应）
+    #          | http（直连分页接口，不启动浏览器）| pagesource（page_source 离线解析）
+    #          | sharded（多进程并行采集多个榜单）
+    # 除 sharded 外都通过 on_rows 边采集边写断点日志和上传；sharded 要等所有分片进程结束、合并排名后
+    # 才整体交给上传管道，中途崩溃时断点日志里没有它的行
+    collector_mode = os.getenv('COLLECTOR_MODE', 'dom').strip() or 'dom'
+    print(f"🧭 采集模式: {collector_mode}")
+
+    # 断点续采：--resume 时读取断点日志，补传未上传的行，并从最后排名之后继续采集
+    resume = '--resume' in sys.argv
+    # 未指定 JOURNAL_FILE 时新运行按日期命名，续采时取最近的日志（可能是前一天的）
+    journal_file = os.getenv('JOURNAL_FILE') or (resume and latest_journal()) or \
+        f"./toolify-journal-{datetime.now().strftime('%Y-%m-%d')}.ndjson"
+    resumed_rows, uploaded_names = load_journal(journal_file) if resume else ([], set())
+    start_index = max((tool["ranking"] for tool in resumed_rows), default=0)
+    if resume and not resumed_rows:
+        print(f"⚠️ 未找到可恢复的断点日志 {journal_file}，重新开始采集")
+
+    journal = CollectionJournal(journal_file, fsync_every=int(os.getenv('JOURNAL_FSYNC_EVERY', '50')))
+    journal.open(resume=bool(resumed_rows))
+    print(f"📓 断点日志: {journal_file}")
+
+    # 边采集边上传：满一批就上传，备份增量写入
+    settings = get_settings_from_db()
+    uploader = StreamingUploader(
+        BackupWriter.for_run('toolify'),
+        batch_size=settings['batch_size'],
+        journal=journal,
+        concurrency=int(os.getenv('UPLOAD_CONCURRENCY') or '1'),
+        delta=os.getenv('UPLOAD_DELTA', '').strip().lower() in ('1', 'true', 'yes'),
+        mode=get_upload_mode(),
+        snapshots=snapshots_enabled()
     )
+    uploader.start()
+    if resumed_rows:
+        uploader.resume(resumed_rows, uploaded_names)
 
-    if not tools_data:
+    # 采集数据
+    tools_data = []
+    if collector_mode == 'http':
+        tools_data = collect_toolify_data_http(
+            target_count=target_count,
+            concurrency=int(os.getenv('HTTP_CONCURRENCY', '8')),
+            per_page=int(os.getenv('HTTP_PER_PAGE', '100')),
+            on_rows=uploader.add
+        )
+        if not tools_data:
+            print("⚠️ 直连接口未获取到数据，回退到 DOM 采集")
+    elif collector_mode == 'sharded':
+        shard_urls = [u.strip() for u in os.getenv('COLLECTOR_SHARDS', '').split(',') if u.strip()]
+        workers = os.getenv('COLLECTOR_WORKERS')
+        tools_data = collect_toolify_data_sharded(
+            target_count=target_count,
+            max_scroll_attempts=max_scroll_attempts,
+            shard_urls=shard_urls or None,
+            workers=int(workers) if workers else None
+        )
+    elif collector_mode == 'pagesource':
+        tools_data = collect_toolify_data_pagesource(
+            target_count=target_count,
+            max_scroll_attempts=max_scroll_attempts,
+            on_rows=uploader.add
+        )
+    elif collector_mode == 'network':
+        tools_data = collect_toolify_data_network(
+            target_count=target_count,
+            max_scroll_attempts=max_scroll_attempts,
+            on_rows=uploader.add
+        )
+        if not tools_data:
+            print("⚠️ 网络抓包未获取到数据，回退到 DOM 采集")
+
+    if tools_data:
+        # sharded 模式的数据在这里整体交给上传管道；其他模式已边采集边交付，add 会跳过已交付的行
+        uploader.add(tools_data)
+    else:
+        # DOM 模式每轮提取后直接把新行交给上传管道，续采时跳过已采集的行
+        tools_data = collect_toolify_data(
+            target_count=target_count - len(resumed_rows),
+            max_scroll_attempts=max_scroll_attempts,
+            on_rows=uploader.add,
+            start_index=start_index
+        ) if target_count > len(resumed_rows) else []
+
+    success_count = uploader.close()
+
+    # 采集到的行已经写入备份，这里只看条数，不再合并一份完整列表
+    if not uploader.total_rows:
         print("💥 采集失败，没有获取到数据")
         exit(1)
 
-    # 保存本地备份
-    backup_file = f"./toolify-backup-{datetime.now().strftime('%Y-%m-%d')}.json"
-    with open(backup_file, 'w', encoding='utf-8') as f:
-        json.dump(tools_data, f, ensure_ascii=False, indent=2)
-    print(f"💾 本地备份已保存: {backup_file}")
-
-    # 上传到Supabase
-    upload_success = upload_to_supabase(tools_data)
-
-    if upload_success:
+    if success_count > 0:
         print("🎉 数据采集和上传任务完成！")
     else:
         print("💥 数据上传失败")
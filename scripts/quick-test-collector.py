@@ -6,8 +6,8 @@
 
 import os
 import time
-import json
-import requests
+from supabase_rest import SupabaseRest
+from collection_backup import BackupWriter
 from datetime import datetime
 
 print("🚀 快速测试采集器启动...")
@@ -31,13 +31,9 @@ def test_environment():
 
     # 测试数据库连接
     try:
-        headers = {
-            'apikey': key.strip(),
-            'Authorization': f'Bearer {key.strip()}',
-            'Content-Type': 'application/json'
-        }
+        client = SupabaseRest(url, key)
 
-        response = requests.get(f'{url.strip()}/rest/v1/toolify_tools?limit=1', headers=headers, timeout=10)
+        response = client.get('toolify_tools?limit=1', timeout=10)
 
         if response.status_code == 200:
             print("✅ 数据库连接正常")
@@ -50,8 +46,8 @@ def test_environment():
         print(f"❌ 连接测试异常: {e}")
         return False
 
-def create_mock_data(count=5):
-    """创建模拟数据进行测试"""
+def create_mock_data(backup, count=5):
+    """创建模拟数据进行测试，每条创建后立即写入备份"""
     print(f"🎭 创建 {count} 条模拟测试数据...")
 
     mock_tools = []
@@ -70,7 +66,9 @@ def create_mock_data(count=5):
             "collection_batch": f"quick-test-{datetime.now().strftime('%Y-%m-%d-%H%M')}"
         }
         mock_tools.append(tool_data)
+        backup.write([tool_data])
 
+    backup.flush()
     print("✅ 模拟数据创建完成")
     return mock_tools
 
@@ -81,19 +79,14 @@ def upload_test_data(tools_data):
     url = os.getenv('SUPABASE_URL').strip()
     key = os.getenv('SUPABASE_ANON_KEY').strip()
 
-    headers = {
-        'apikey': key,
-        'Authorization': f'Bearer {key}',
-        'Content-Type': 'application/json'
-    }
+    client = SupabaseRest(url, key)
 
     success_count = 0
 
     for i, tool in enumerate(tools_data):
         try:
-            response = requests.post(
-                f'{url}/rest/v1/toolify_tools',
-                headers=headers,
+            response = client.post(
+                'toolify_tools',
                 json=tool,
                 timeout=15
             )
@@ -127,14 +120,12 @@ def main():
 
     print(f"🎯 快速测试目标: {target_count} 条数据")
 
-    # 3. 创建测试数据
-    test_data = create_mock_data(target_count)
+    # 3. 创建测试数据，同时写入备份
+    backup = BackupWriter.for_run('quick-test')
+    test_data = create_mock_data(backup, target_count)
 
-    # 4. 保存备份
-    backup_file = f"./quick-test-backup-{datetime.now().strftime('%Y%m%d-%H%M')}.json"
-    with open(backup_file, 'w', encoding='utf-8') as f:
-        json.dump(test_data, f, ensure_ascii=False, indent=2)
-    print(f"💾 备份已保存: {backup_file}")
+    # 4. 写出备份汇总行并清理旧备份
+    backup.close()
 
     # 5. 上传测试
     upload_success = upload_test_data(test_data)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+滚动就绪等待 - 用行数变化代替固定 sleep
+页面内 MutationObserver 监听 tr.el-table__row 数量，行数一增长立即返回；
+异步脚本不可用时退化为轮询行数
+"""
+
+import time
+
+ROW_SELECTOR = "tr.el-table__row"
+
+# 异步等待脚本：行数超过 prev_count 或超时后回调，返回当前行数
+WAIT_FOR_GROWTH_JS = """
+const selector = arguments[0];
+const prevCount = arguments[1];
+const timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const count = () => document.querySelectorAll(selector).length;
+if (count() > prevCount) { done(count()); return; }
+let finished = false;
+const finish = () => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(count());
+};
+const observer = new MutationObserver(() => { if (count() > prevCount) finish(); });
+observer.observe(document.body, {childList: true, subtree: true});
+const timer = setTimeout(finish, timeoutMs);
+"""
+
+COUNT_ROWS_JS = "return document.querySelectorAll(arguments[0]).length;"
+
+PAGE_STATE_JS = """
+const height = document.body.scrollHeight;
+return [height, window.innerHeight + window.scrollY >= height - 50];
+"""
+
+
+class ScrollReadiness:
+    """滚动后的行数就绪等待器，按本次运行观测到的加载延迟自适应超时"""
+
+    def __init__(self, driver, min_timeout=1.0, max_timeout=15.0, end_after=3, poll_interval=0.25):
+        self.driver = driver
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.end_after = end_after  # 在底部连续多少次超时且页面高度不变视为到底
+        self.poll_interval = poll_interval
+
+        # 与 TCP RTO 相同的平滑估计：timeout = srtt + 4 * rttvar
+        self.srtt = None
+        self.rttvar = None
+        self.consecutive_misses = 0
+        self.last_height = None
+        self.use_observer = True
+
+    @property
+    def timeout(self):
+        """当前自适应超时（秒）"""
+        if self.srtt is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, self.srtt + 4 * self.rttvar))
+
+    @property
+    def reached_end(self):
+        """是否已检测到列表真正到底"""
+        return self.consecutive_misses >= self.end_after
+
+    def count_rows(self):
+        """当前页面行数"""
+        return self.driver.execute_script(COUNT_ROWS_JS, ROW_SELECTOR)
+
+    def _record_latency(self, latency):
+        """记录一次加载延迟，更新平滑估计"""
+        if self.srtt is None:
+            self.srtt = latency
+            self.rttvar = latency / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - latency)
+            self.srtt = 0.875 * self.srtt + 0.125 * latency
+
+    def _page_state(self):
+        """返回 (页面高度, 是否已滚动到底部)"""
+        try:
+            return self.driver.execute_script(PAGE_STATE_JS)
+        except Exception:
+            return None, False
+
+    def _wait_observer(self, prev_count, timeout):
+        """页面内 MutationObserver 等待，一次驱动往返"""
+        self.driver.set_script_timeout(timeout + 5)
+        return self.driver.execute_async_script(WAIT_FOR_GROWTH_JS, ROW_SELECTOR, prev_count, int(timeout * 1000))
+
+    def _wait_polling(self, prev_count, timeout):
+        """轮询行数等待"""
+        deadline = time.monotonic() + timeout
+        count = self.count_rows()
+        while count <= prev_count and time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            count = self.count_rows()
+        return count
+
+    def wait_for_growth(self, prev_count, timeout=None, learn=True):
+        """等待行数超过 prev_count，返回最新行数；超时返回当前行数
+        learn=False 时只等待，不更新延迟估计和到底检测"""
+        timeout = timeout or self.timeout
+        start = time.monotonic()
+
+        count = None
+        if self.use_observer:
+            try:
+                count = self._wait_observer(prev_count, timeout)
+            except Exception as e:
+                print(f"⚠️ MutationObserver 等待失败，改用轮询: {e}")
+                self.use_observer = False
+        if count is None:
+            count = self._wait_polling(prev_count, max(0.0, timeout - (time.monotonic() - start)))
+
+        if not learn:
+            return count
+
+        if count > prev_count:
+            self._record_latency(time.monotonic() - start)
+            self.consecutive_misses = 0
+        else:
+            # 已在底部且行数、页面高度都不再变化才计为一次"到底"
+            height, at_bottom = self._page_state()
+            if not at_bottom:
+                self.consecutive_misses = 0
+            elif height == self.last_height:
+                self.consecutive_misses += 1
+            else:
+                self.consecutive_misses = 1
+            self.last_height = height
+
+        return count
+
+    def wait_for_rows(self, min_count=1, timeout=None):
+        """首屏加载：等待至少出现 min_count 行"""
+        # 首屏延迟包含整页加载，不计入滚动延迟估计
+        return self.wait_for_growth(min_count - 1, timeout or self.max_timeout, learn=False)
@@ -4,7 +4,7 @@
 """
 
 import os
-import requests
+from supabase_rest import SupabaseRest
 
 def clear_database():
     """清除数据库中的测试数据"""
@@ -22,18 +22,13 @@ def clear_database():
 
     print(f"连接数据库: {url[:50]}...")
 
-    headers = {
-        'apikey': key,
-        'Authorization': f'Bearer {key}',
-        'Content-Type': 'application/json'
-    }
+    client = SupabaseRest(url, key)
 
     try:
         # 查看当前数据量
         print("查询当前数据量...")
-        count_response = requests.get(
-            f'{url}/rest/v1/toolify_tools?select=count(*)',
-            headers=headers,
+        count_response = client.get(
+            'toolify_tools?select=count(*)',
             timeout=30
         )
 
@@ -46,9 +41,8 @@ def clear_database():
 
         # 清除所有工具数据
         print("删除所有工具数据...")
-        delete_response = requests.delete(
-            f'{url}/rest/v1/toolify_tools?id=neq.null',
-            headers=headers,
+        delete_response = client.delete(
+            'toolify_tools?id=neq.null',
             timeout=60
         )
 
@@ -60,9 +54,8 @@ def clear_database():
 
         # 清除用户操作数据
         print("删除所有用户操作数据...")
-        user_delete_response = requests.delete(
-            f'{url}/rest/v1/user_actions?id=neq.null',
-            headers=headers,
+        user_delete_response = client.delete(
+            'user_actions?id=neq.null',
             timeout=60
         )
 
@@ -73,9 +66,8 @@ def clear_database():
 
         # 验证清理结果
         print("验证清理结果...")
-        verify_response = requests.get(
-            f'{url}/rest/v1/toolify_tools?select=count(*)',
-            headers=headers,
+        verify_response = client.get(
+            'toolify_tools?select=count(*)',
             timeout=30
         )
 
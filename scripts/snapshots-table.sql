@@ -0,0 +1,81 @@
+-- 工具历史快照表：每次采集的全部行只追加不覆盖，用于趋势分析
+-- 一个批次（collection_batch）里每个工具只有一行：同一天重跑或手动重新触发同一批次时，已有的行按主键忽略，只补写缺少的工具
+-- 分区表的主键必须包含分区键，所以按批次日期 batch_date（从批次号 github-actions-2025-01-01 解析，
+-- 批次号不含日期时取采集当天）的月份范围分区，主键是 (collection_batch, tool_name, batch_date)；
+-- batch_date 由批次号决定，主键实际上就是 (tool_name, collection_batch)
+-- 旧月份可以整个分区归档或删除
+CREATE TABLE IF NOT EXISTS toolify_tool_snapshots (
+    tool_name VARCHAR(255) NOT NULL,
+    collection_batch VARCHAR(100) NOT NULL,
+    batch_date DATE NOT NULL,
+    collected_at TIMESTAMP NOT NULL,
+    ranking INTEGER,
+    tool_url VARCHAR(500),
+    monthly_visits VARCHAR(100),
+    growth VARCHAR(100),
+    growth_rate VARCHAR(50),
+    monthly_visits_num BIGINT,
+    growth_num BIGINT,
+    growth_rate_num DOUBLE PRECISION,
+    description TEXT,
+    tags TEXT,
+    -- 主键索引同时服务“某个批次的全部工具”按 tool_name 键集分页（scripts/diff-collections.py）
+    PRIMARY KEY (collection_batch, tool_name, batch_date)
+) PARTITION BY RANGE (batch_date);
+
+-- “某一批次的全部工具”按排名读取；查询时带上 batch_date 条件才能只扫描该月的分区
+CREATE INDEX IF NOT EXISTS idx_toolify_tool_snapshots_batch_ranking
+    ON toolify_tool_snapshots(collection_batch, ranking);
+
+-- “某个工具的历史”: WHERE tool_name = ? ORDER BY batch_date DESC
+CREATE INDEX IF NOT EXISTS idx_toolify_tool_snapshots_tool_date
+    ON toolify_tool_snapshots(tool_name, batch_date DESC);
+
+-- 创建某个月的分区（已存在则跳过），返回分区表名
+-- 采集脚本写入前会对数据涉及的月份调用: POST /rest/v1/rpc/create_toolify_snapshot_partition {"p_month": "2025-01-01"}
+-- 匿名角色没有建表权限，所以用 SECURITY DEFINER 以函数所有者身份执行
+-- 采集脚本用的是公开的 anon key，为防止任何人借它无限创建分区，只允许上月、本月和下月
+-- （上月用于月初补写前一天的批次）；更早的月份由管理员直接执行 SQL 创建
+CREATE OR REPLACE FUNCTION create_toolify_snapshot_partition(p_month DATE)
+RETURNS TEXT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    month_start DATE := date_trunc('month', p_month)::DATE;
+    partition_name TEXT := format('toolify_tool_snapshots_%s', to_char(month_start, 'YYYY_MM'));
+BEGIN
+    IF month_start < (date_trunc('month', CURRENT_DATE) - INTERVAL '1 month')::DATE
+        OR month_start > (date_trunc('month', CURRENT_DATE) + INTERVAL '1 month')::DATE THEN
+        RAISE EXCEPTION '只能创建上月、本月或下月的快照分区: %', month_start;
+    END IF;
+
+    IF to_regclass(partition_name) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF toolify_tool_snapshots FOR VALUES FROM (%L) TO (%L)',
+            partition_name, month_start, (month_start + INTERVAL '1 month')::DATE
+        );
+        EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', partition_name);
+    END IF;
+    RETURN partition_name;
+END;
+$$;
+
+-- 默认所有角色（PUBLIC）都能执行函数；收回后只授权给采集脚本使用的角色
+REVOKE EXECUTE ON FUNCTION create_toolify_snapshot_partition(DATE) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION create_toolify_snapshot_partition(DATE) TO anon, authenticated, service_role;
+
+-- 预先创建本月和下月的分区
+SELECT create_toolify_snapshot_partition(CURRENT_DATE);
+SELECT create_toolify_snapshot_partition((CURRENT_DATE + INTERVAL '1 month')::DATE);
+
+-- 启用行级安全 (RLS)
+ALTER TABLE toolify_tool_snapshots ENABLE ROW LEVEL SECURITY;
+
+-- 快照只读取和追加
+CREATE POLICY "Enable read access for all users" ON toolify_tool_snapshots
+    FOR SELECT USING (true);
+
+CREATE POLICY "Enable insert for all users" ON toolify_tool_snapshots
+    FOR INSERT WITH CHECK (true);
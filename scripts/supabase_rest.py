@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Supabase REST 客户端 - 所有脚本共用
+复用同一个 requests.Session：keep-alive 连接池，默认请求头只构建一次，
+避免每个请求都重新建立 TCP+TLS 连接
+批量写入用 post_json()：紧凑 UTF-8 JSON（装了 orjson 时用 orjson），可选 gzip 请求体
+"""
+
+import os
+import gzip
+import json
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def dumps(payload):
+    """序列化为紧凑的 UTF-8 JSON 字节；中文不转义成 \\uXXXX，也不带多余空格"""
+    if HAS_ORJSON:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class PayloadStats:
+    """累计请求体的编码前/发送字节数和编码 CPU 耗时，上传线程共用"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.raw_bytes = 0
+        self.wire_bytes = 0
+        self.cpu_seconds = 0.0
+
+    def add(self, raw_bytes, wire_bytes, cpu_seconds):
+        with self.lock:
+            self.requests += 1
+            self.raw_bytes += raw_bytes
+            self.wire_bytes += wire_bytes
+            self.cpu_seconds += cpu_seconds
+
+    def summary(self):
+        if not self.requests:
+            return "无请求体"
+        return (f"{self.requests} 个请求, JSON {self.raw_bytes / 1024:.0f} KB, 发送 {self.wire_bytes / 1024:.0f} KB, "
+                f"编码 CPU 平均 {self.cpu_seconds / self.requests * 1000:.1f}ms/批")
+
+
+class SupabaseRest:
+    """带连接池的 Supabase REST 客户端，路径相对于 /rest/v1/"""
+
+    def __init__(self, url, key, pool_size=10, compress=False, compress_level=6):
+        self.url = url.strip().rstrip('/')
+        self.base_url = f'{self.url}/rest/v1'
+        self.compress = compress  # 请求体 gzip，需要网关支持 Content-Encoding: gzip
+        self.compress_level = compress_level
+        self.payload_stats = PayloadStats()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        key = key.strip()
+        self.session.headers.update({
+            'apikey': key,
+            'Authorization': f'Bearer {key}',
+            'Content-Type': 'application/json'
+        })
+
+    def request(self, method, path, timeout=30, **kwargs):
+        """发送请求；额外的 headers 会与默认请求头合并"""
+        return self.session.request(method, f'{self.base_url}/{path}', timeout=timeout, **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def head(self, path, **kwargs):
+        return self.request('HEAD', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request('PATCH', path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+    def encode(self, payload):
+        """编码请求体，返回 (body, 额外请求头)，并把字节数和 CPU 耗时计入 payload_stats"""
+        start = time.thread_time()
+        body = dumps(payload)
+        raw_bytes = len(body)
+        headers = {}
+        if self.compress:
+            body = gzip.compress(body, compresslevel=self.compress_level, mtime=0)
+            headers['Content-Encoding'] = 'gzip'
+        self.payload_stats.add(raw_bytes, len(body), time.thread_time() - start)
+        return body, headers
+
+    def post_json(self, path, payload, headers=None, **kwargs):
+        """用 encode() 编码后 POST，代替 post(json=...)"""
+        body, extra_headers = self.encode(payload)
+        if headers:
+            extra_headers.update(headers)
+        return self.post(path, data=body, headers=extra_headers, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def client_from_env(pool_size=10):
+    """用 SUPABASE_URL / SUPABASE_ANON_KEY 创建客户端，配置缺失时返回 None
+
+    UPLOAD_GZIP=true 时批量写入的请求体用 gzip 压缩
+    """
+    url = os.getenv('SUPABASE_URL')
+    key = os.getenv('SUPABASE_ANON_KEY')
+
+    if not url or not key:
+        return None
+
+    compress = os.getenv('UPLOAD_GZIP', '').strip().lower() in ('1', 'true', 'yes')
+    return SupabaseRest(url, key, pool_size=pool_size, compress=compress)
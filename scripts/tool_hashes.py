@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+增量上传 - 按内容哈希跳过未变化的工具
+content_hash 只覆盖页面上的字段，collected_at / collection_batch 每次都变，不参与计算
+采集时 build_tool_data 就算好 content_hash，每种上传模式都写入，库中的哈希不会落后于内容
+需要先执行 scripts/add-content-hash.sql 给 toolify_tools 加上 content_hash 列
+"""
+
+import json
+import hashlib
+
+HASH_FIELDS = ["ranking", "tool_url", "monthly_visits", "growth", "growth_rate", "description", "tags"]
+
+
+def content_hash(tool):
+    """tool_data 内容字段的 sha256"""
+    values = [tool.get(field, "") for field in HASH_FIELDS]
+    return hashlib.sha256(json.dumps(values, ensure_ascii=False, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def fetch_existing_hashes(client, page_size=1000):
+    """按 tool_name 键集分页拉取库中已有的 {tool_name: content_hash}
+
+    content_hash 列不存在或请求失败时返回 None
+    """
+    hashes = {}
+    last_name = None
+
+    while True:
+        params = {'select': 'tool_name,content_hash', 'order': 'tool_name.asc', 'limit': page_size}
+        if last_name is not None:
+            params['tool_name'] = f'gt.{last_name}'
+        response = client.get('toolify_tools', params=params, timeout=30)
+        if response.status_code != 200:
+            print(f"⚠️ 读取已有内容哈希失败: {response.status_code} - {response.text[:200]}")
+            return None
+
+        page = response.json()
+        for row in page:
+            hashes[row['tool_name']] = row.get('content_hash')
+        if len(page) < page_size:
+            return hashes
+        last_name = page[-1]['tool_name']
+
+
+def split_changed(tools_data, existing_hashes):
+    """返回 (新增或有变化的行（附带 content_hash）, 未变化的行)"""
+    changed = []
+    unchanged = []
+
+    for tool in tools_data:
+        digest = content_hash(tool)
+        if existing_hashes.get(tool["tool_name"]) == digest:
+            unchanged.append(tool)
+        else:
+            changed.append(dict(tool, content_hash=digest))
+
+    return changed, unchanged
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Toolify 接口数据解析 - 把排行榜 JSON 记录转换成与 DOM 提取一致的原始行
+网络抓包模式和直连 HTTP 模式共用
+另有显示值 -> 数值的解析（"5.8B" -> 5800000000、"2.21%" -> 2.21），写入 *_num 数值列
+以及批次号 -> 批次日期（github-actions-2025-01-01 -> 2025-01-01），历史快照表按它分区
+"""
+
+import re
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+# 各字段在接口记录中可能出现的键名，按优先级排列
+NAME_KEYS = ["name", "tool_name", "title"]
+HANDLE_KEYS = ["handle", "slug"]
+URL_KEYS = ["tool_url", "url", "website"]
+VISITS_KEYS = ["month_visited_count", "monthly_visits", "visits", "visited_count"]
+GROWTH_KEYS = ["growth", "month_growth", "growth_count"]
+GROWTH_RATE_KEYS = ["growth_rate", "month_growth_rate"]
+DESCRIPTION_KEYS = ["description", "what_is_summary", "summary", "desc"]
+TAGS_KEYS = ["tags", "categories", "category"]
+RANKING_KEYS = ["ranking", "rank", "position"]
+
+# 显示值 -> 数值列
+NUMERIC_FIELDS = [
+    ("monthly_visits", "monthly_visits_num"),
+    ("growth", "growth_num"),
+    ("growth_rate", "growth_rate_num"),
+]
+UNIT_MULTIPLIERS = {"": 1, "K": 10 ** 3, "M": 10 ** 6, "B": 10 ** 9, "T": 10 ** 12, "万": 10 ** 4, "亿": 10 ** 8}
+RANKING_PATTERN = re.compile(r"\d+")
+BATCH_DATE_PATTERN = re.compile(r"(\d{4})-?(\d{2})-?(\d{2})")
+METRIC_PATTERN = re.compile(r"^([+-]?)\s*(\d[\d,]*(?:\.\d+)?|\.\d+)\s*([KMBT万亿]?)\s*(%?)$", re.IGNORECASE)
+
+
+def first_value(record, keys):
+    """按优先级取第一个非空字段"""
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def format_compact_number(value):
+    """数字格式化成页面上的显示形式：5800000000 -> 5.8B"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    for threshold, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if value >= threshold:
+            return f"{sign}{value / threshold:.1f}{suffix}"
+    return f"{sign}{int(value)}"
+
+
+def format_percent(value):
+    """增长率格式化：接口给出的是百分数数值（2.21 表示 2.21%）"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    return f"{value:.2f}%"
+
+
+@lru_cache(maxsize=65536)
+def parse_metric(text):
+    """解析显示值，返回 (Decimal 数值, 是否百分数)；"-"、空串等无法解析时返回 None
+
+    同一批数据里重复的显示值很多，结果按字符串缓存
+    """
+    match = METRIC_PATTERN.match(text.strip().replace("\u2212", "-"))
+    if not match:
+        return None
+    sign, digits, unit, percent = match.groups()
+    value = Decimal(digits.replace(",", "")) * UNIT_MULTIPLIERS[unit.upper()]
+    return (-value if sign == "-" else value), bool(percent)
+
+
+def parse_compact_number(text):
+    """"5.8B" -> 5800000000，"-126.6M" -> -126600000（精确整数）"""
+    if isinstance(text, (int, float)):
+        return int(text)
+    parsed = parse_metric(text or "")
+    if parsed is None or parsed[1]:
+        return None
+    return int(parsed[0].to_integral_value(ROUND_HALF_UP))
+
+
+def parse_percent(text):
+    """"2.21%" -> 2.21（百分数数值，与接口一致）"""
+    if isinstance(text, (int, float)):
+        return float(text)
+    parsed = parse_metric(text or "")
+    return float(parsed[0]) if parsed else None
+
+
+NUMERIC_PARSERS = {
+    "monthly_visits": parse_compact_number,
+    "growth": parse_compact_number,
+    "growth_rate": parse_percent,
+}
+
+
+def numeric_metrics(row):
+    """一行的显示值 -> {"monthly_visits_num": ..., "growth_num": ..., "growth_rate_num": ...}
+
+    行里已经带有精确数值（接口记录）时直接使用
+    """
+    return {
+        num_field: row[num_field] if row.get(num_field) is not None else NUMERIC_PARSERS[field](row.get(field))
+        for field, num_field in NUMERIC_FIELDS
+    }
+
+
+def format_tags(value):
+    """标签可能是字符串、字符串列表或带 name 的对象列表"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        value = [value]
+    names = []
+    for tag in value:
+        if isinstance(tag, dict):
+            tag = first_value(tag, NAME_KEYS)
+        if tag:
+            names.append(str(tag).strip())
+    return ", ".join(names)
+
+
+def is_tool_record(item):
+    """是否像一条工具记录"""
+    return isinstance(item, dict) and first_value(item, NAME_KEYS) is not None and (
+        first_value(item, HANDLE_KEYS) is not None or first_value(item, URL_KEYS) is not None
+    )
+
+
+def find_tool_records(payload):
+    """在任意嵌套的 JSON 中找出最长的工具记录列表"""
+    best = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            if node and all(is_tool_record(item) for item in node) and len(node) > len(best):
+                best = node
+            else:
+                stack.extend(item for item in node if isinstance(item, (dict, list)))
+    return best
+
+
+def record_to_raw_row(record, lang="zh"):
+    """接口记录 -> 原始行（字段与 DOM 批量提取结果一致，再交给 build_tool_data）"""
+    handle = first_value(record, HANDLE_KEYS)
+    if handle:
+        tool_url = f"https://www.toolify.ai/{lang}/tool/{handle}"
+    else:
+        tool_url = first_value(record, URL_KEYS) or ""
+
+    visits = first_value(record, VISITS_KEYS)
+    growth = first_value(record, GROWTH_KEYS)
+    growth_rate = first_value(record, GROWTH_RATE_KEYS)
+
+    return {
+        "tool_name": str(first_value(record, NAME_KEYS)).strip(),
+        "tool_url": tool_url,
+        "monthly_visits": format_compact_number(visits),
+        "growth": format_compact_number(growth),
+        "growth_rate": format_percent(growth_rate),
+        # 接口给出的原始数值比显示值精确，直接保留
+        "monthly_visits_num": parse_compact_number(visits),
+        "growth_num": parse_compact_number(growth),
+        "growth_rate_num": parse_percent(growth_rate),
+        "description": (first_value(record, DESCRIPTION_KEYS) or "").strip(),
+        "tags": format_tags(first_value(record, TAGS_KEYS)),
+        "ranking": first_value(record, RANKING_KEYS)
+    }
+
+
+def parse_ranking(value, fallback):
+    """接口记录中的排名（12、"12"、"#12"、"1,234"），缺失或无法解析时返回按位置推算的 fallback"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if value > 0 else fallback
+    match = RANKING_PATTERN.search(str(value or "").replace(",", ""))
+    if not match or int(match.group()) <= 0:
+        return fallback
+    return int(match.group())
+
+
+def batch_date(collection_batch):
+    """批次号中的日期（ISO 字符串），没有合法日期时返回 None
+
+    同一批次号总是得到同一天，(tool_name, collection_batch) 因此能作为快照的唯一键
+    """
+    match = BATCH_DATE_PATTERN.search(collection_batch or "")
+    if not match:
+        return None
+    try:
+        return date(*(int(part) for part in match.groups())).isoformat()
+    except ValueError:
+        return None
@@ -0,0 +1,85 @@
+-- 批量 upsert 函数：整批工具数据一次集合操作写入 toolify_tools
+-- 调用: POST /rest/v1/rpc/upsert_toolify_tools  请求体 {"tools": [{...}, ...]}
+-- 返回: {"inserted": 新增条数, "updated": 更新条数, "unchanged": 内容未变化条数}
+-- 依赖 content_hash 列（init-database.sql 或 add-content-hash.sql）和 *_num 数值列（add-numeric-metrics.sql）
+CREATE OR REPLACE FUNCTION upsert_toolify_tools(tools JSONB)
+RETURNS JSON
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    total_count INTEGER;
+    inserted_count INTEGER;
+    updated_count INTEGER;
+BEGIN
+    WITH incoming AS (
+        -- 同一批内重复的工具名只保留排名最靠前的一条（ON CONFLICT 不能在一条语句里更新同一行两次）
+        SELECT DISTINCT ON (r.tool_name) r.*
+        FROM jsonb_to_recordset(tools) AS r(
+            ranking INTEGER,
+            tool_name VARCHAR(255),
+            tool_url VARCHAR(500),
+            monthly_visits VARCHAR(100),
+            growth VARCHAR(100),
+            growth_rate VARCHAR(50),
+            monthly_visits_num BIGINT,
+            growth_num BIGINT,
+            growth_rate_num DOUBLE PRECISION,
+            description TEXT,
+            tags TEXT,
+            collected_at TIMESTAMP,
+            collection_batch VARCHAR(100),
+            content_hash VARCHAR(64)
+        )
+        ORDER BY r.tool_name, r.ranking
+    ),
+    written AS (
+        INSERT INTO toolify_tools AS t (
+            ranking, tool_name, tool_url, monthly_visits, growth, growth_rate,
+            monthly_visits_num, growth_num, growth_rate_num,
+            description, tags, collected_at, collection_batch, content_hash
+        )
+        SELECT
+            ranking, tool_name, tool_url, monthly_visits, growth, growth_rate,
+            monthly_visits_num, growth_num, growth_rate_num,
+            description, tags, COALESCE(collected_at, NOW()), collection_batch, content_hash
+        FROM incoming
+        ON CONFLICT (tool_name) DO UPDATE SET
+            ranking = EXCLUDED.ranking,
+            tool_url = EXCLUDED.tool_url,
+            monthly_visits = EXCLUDED.monthly_visits,
+            growth = EXCLUDED.growth,
+            growth_rate = EXCLUDED.growth_rate,
+            monthly_visits_num = EXCLUDED.monthly_visits_num,
+            growth_num = EXCLUDED.growth_num,
+            growth_rate_num = EXCLUDED.growth_rate_num,
+            description = EXCLUDED.description,
+            tags = EXCLUDED.tags,
+            collected_at = EXCLUDED.collected_at,
+            collection_batch = EXCLUDED.collection_batch,
+            content_hash = EXCLUDED.content_hash,
+            updated_at = NOW()
+        -- 内容字段和 content_hash 都没变的行不写入，计为 unchanged
+        -- content_hash 也要比较：哈希或 *_num 列出现之前写入的行 content_hash 为空，需要补写一次，
+        -- 否则增量上传每次都把它们当作有变化重新发送（*_num 由参与哈希的字段解析而来，随哈希一起补上）
+        WHERE (t.ranking, t.tool_url, t.monthly_visits, t.growth, t.growth_rate, t.description, t.tags,
+               t.content_hash)
+            IS DISTINCT FROM
+            (EXCLUDED.ranking, EXCLUDED.tool_url, EXCLUDED.monthly_visits, EXCLUDED.growth,
+             EXCLUDED.growth_rate, EXCLUDED.description, EXCLUDED.tags, EXCLUDED.content_hash)
+        -- xmax = 0 表示本语句新插入的行，否则是冲突后更新的行
+        RETURNING (t.xmax = 0) AS inserted
+    )
+    SELECT
+        (SELECT COUNT(*) FROM incoming),
+        COUNT(*) FILTER (WHERE inserted),
+        COUNT(*) FILTER (WHERE NOT inserted)
+    INTO total_count, inserted_count, updated_count
+    FROM written;
+
+    RETURN json_build_object(
+        'inserted', inserted_count,
+        'updated', updated_count,
+        'unchanged', total_count - inserted_count - updated_count
+    );
+END;
+$$;
@@ -1,5 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server'
-import { toolsApi } from '@/lib/supabase'
+import { toolsApi, NumericRanges } from '@/lib/supabase'
 
 // 强制动态渲染
 export const dynamic = 'force-dynamic'
@@ -13,7 +13,19 @@ export async function GET(request: NextRequest) {
     const sortBy = searchParams.get('sortBy') || 'ranking'
     const sortOrder = searchParams.get('sortOrder') || 'asc'
 
-    const result = await toolsApi.getTools(page, limit, search, sortBy, sortOrder)
+    // 数值范围过滤：min_monthly_visits=1000000&max_growth_rate=50
+    const parseBound = (value: string | null) =>
+      value !== null && value !== '' && Number.isFinite(Number(value)) ? Number(value) : undefined
+    const ranges: NumericRanges = {}
+    for (const field of ['monthly_visits', 'growth', 'growth_rate'] as const) {
+      const min = parseBound(searchParams.get(`min_${field}`))
+      const max = parseBound(searchParams.get(`max_${field}`))
+      if (min !== undefined || max !== undefined) {
+        ranges[field] = { min, max }
+      }
+    }
+
+    const result = await toolsApi.getTools(page, limit, search, sortBy, sortOrder, ranges)
 
     return NextResponse.json({
       success: true,
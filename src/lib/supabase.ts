@@ -5,10 +5,31 @@ const supabaseAnonKey = process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY!
 
 export const supabase = createClient(supabaseUrl, supabaseAnonKey)
 
+// 显示值列排序/过滤时改用对应的数值列（字符串排序 "9.1K" 会排在 "5.8B" 前面）
+const NUMERIC_COLUMNS: Record<string, string> = {
+  monthly_visits: 'monthly_visits_num',
+  growth: 'growth_num',
+  growth_rate: 'growth_rate_num'
+}
+
+// 数值范围过滤，如 { monthly_visits: { min: 1000000 } }
+export type NumericRanges = Partial<Record<'monthly_visits' | 'growth' | 'growth_rate', { min?: number; max?: number }>>
+
+// 搜索的三列各有一个三元组 GIN 索引（scripts/add-search-indexes.sql），ILIKE '%关键词%' 不再顺序扫描
+const SEARCH_COLUMNS = ['tool_name', 'description', 'tags']
+
+// 关键词里的 % _ \ 按字面匹配；整体加双引号，逗号、括号不会被当成 or 过滤的语法
+// 不足 3 个字符的关键词（如 "AI"、"视频"）提取不出三元组，会顺序扫描全表，但匹配范围不变
+function searchFilter(search: string) {
+  const pattern = `%${search.replace(/[\\%_]/g, '\\$&')}%`
+  const quoted = `"${pattern.replace(/["\\]/g, '\\$&')}"`
+  return SEARCH_COLUMNS.map(column => `${column}.ilike.${quoted}`).join(',')
+}
+
 // 数据库操作函数
 export const toolsApi = {
   // 获取所有工具数据
-  async getTools(page = 1, limit = 50, search = '', sortBy = 'ranking', sortOrder = 'asc') {
+  async getTools(page = 1, limit = 50, search = '', sortBy = 'ranking', sortOrder = 'asc', ranges: NumericRanges = {}) {
     let query = supabase
       .from('toolify_tools')
       .select('*', { count: 'exact' })
@@ -22,11 +43,24 @@ export const toolsApi = {
       query = query.range((page - 1) * limit, page * limit - 1)
     }
 
-    if (search) {
-      query = query.or(`tool_name.ilike.%${search}%,description.ilike.%${search}%,tags.ilike.%${search}%`)
+    const keyword = search.trim()
+    if (keyword) {
+      query = query.or(searchFilter(keyword))
+    }
+
+    for (const [field, range] of Object.entries(ranges)) {
+      const column = NUMERIC_COLUMNS[field]
+      if (!column || !range) continue
+      if (range.min !== undefined) query = query.gte(column, range.min)
+      if (range.max !== undefined) query = query.lte(column, range.max)
     }
 
-    query = query.order(sortBy, { ascending: sortOrder === 'asc' })
+    if (NUMERIC_COLUMNS[sortBy]) {
+      // 无法解析的值（空值）始终排在最后
+      query = query.order(NUMERIC_COLUMNS[sortBy], { ascending: sortOrder === 'asc', nullsFirst: false })
+    } else {
+      query = query.order(sortBy, { ascending: sortOrder === 'asc' })
+    }
 
     const { data, error, count } = await query
 
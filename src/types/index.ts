@@ -6,6 +6,9 @@ export interface Tool {
   monthly_visits: string
   growth: string
   growth_rate: string
+  monthly_visits_num?: number | null
+  growth_num?: number | null
+  growth_rate_num?: number | null
   description: string
   tags: string
   collected_at?: string